@@ -6,11 +6,103 @@ resource assignment, number tokens, and precomputed quality matrices.
 Uses exact vertex-to-tile and vertex-to-neighbor mappings.
 """
 
+import hashlib
+import functools
+import os
+import pickle
 import random
-from typing import Dict, List, Set, Tuple, Optional
+import tempfile
+from typing import Dict, List, Tuple, Optional, Union
 from collections import defaultdict
 
-from quality import compute_quality
+import quality
+from quality import QualityWeights, compute_single_quality_table, compute_pair_quality_table
+
+# Resource types are interned to small ints; names are only used for display
+RESOURCE_NAMES = ('wood', 'brick', 'wheat', 'ore', 'sheep', 'desert')
+RESOURCE_ID = {name: resource_id for resource_id, name in enumerate(RESOURCE_NAMES)}
+DESERT_ID = RESOURCE_ID['desert']
+
+# Bump when the cached data format changes, so that stale on-disk board
+# caches are ignored instead of loaded
+BOARD_CACHE_VERSION = 1
+
+
+@functools.lru_cache(maxsize=None)
+def _quality_code_digest() -> str:
+    """
+    Digest of the source files the cached quality matrices are computed from.
+    
+    Part of every board cache key, so editing board.py or quality.py
+    invalidates existing cache entries without having to delete them.
+    
+    Returns:
+        Hex digest of the two source files
+    """
+    digest = hashlib.sha1()
+    for path in (__file__, quality.__file__):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _dice_probabilities() -> Tuple[float, ...]:
+    """
+    Compute probability of rolling each number (2-12).
+    
+    Returns:
+        Tuple of 13 probabilities indexed by the roll; entries 0 and 1 are 0.0
+    """
+    probs = [0.0] * 13
+    for i in range(2, 13):
+        # Number of ways to roll this number with two dice
+        if i <= 7:
+            ways = i - 1
+        else:
+            ways = 13 - i
+        probs[i] = ways / 36.0
+    return tuple(probs)
+
+
+def _neighbor_masks(vertex_neighbors: Tuple[Tuple[int, ...], ...]) -> Tuple[int, ...]:
+    """
+    Build the distance-rule bitmask of every vertex.
+    
+    Bit j of mask v is set iff j == v or j is adjacent to v, so a vertex is
+    feasible exactly when its mask does not intersect the occupied-vertex mask.
+    
+    Args:
+        vertex_neighbors: Neighboring vertex IDs of every vertex, indexed by vertex_id
+        
+    Returns:
+        Tuple of masks indexed by vertex_id
+    """
+    masks = []
+    for vertex in range(len(vertex_neighbors)):
+        mask = 1 << vertex
+        for neighbor in vertex_neighbors[vertex]:
+            mask |= 1 << neighbor
+        masks.append(mask)
+    return tuple(masks)
+
+
+def _tile_masks(vertex_to_tiles: Tuple[Tuple[int, ...], ...]) -> Tuple[int, ...]:
+    """
+    Build the bitmask of tiles touching every vertex (bit t set iff tile t touches v).
+    
+    Args:
+        vertex_to_tiles: Tile IDs touching every vertex, indexed by vertex_id
+        
+    Returns:
+        Tuple of masks indexed by vertex_id
+    """
+    masks = []
+    for vertex in range(len(vertex_to_tiles)):
+        mask = 0
+        for tile_idx in vertex_to_tiles[vertex]:
+            mask |= 1 << tile_idx
+        masks.append(mask)
+    return tuple(masks)
 
 
 class Board:
@@ -29,105 +121,122 @@ class Board:
         'desert': 1
     }
     
+    # Resource IDs of the 19 tiles before shuffling, in RESOURCE_COUNTS order
+    RESOURCE_POOL = tuple(
+        RESOURCE_ID[resource]
+        for resource, count in RESOURCE_COUNTS.items()
+        for _ in range(count)
+    )
+    RESOURCE_NAMES = RESOURCE_NAMES
+    DESERT_ID = DESERT_ID
+    
     # Standard Catan number token distribution
     NUMBER_TOKENS = [2, 3, 3, 4, 4, 5, 5, 6, 6, 8, 8, 9, 9, 10, 10, 11, 11, 12]
     
-    # Exact vertex to tiles mapping (vertex_id: [tile_ids])
-    VERTEX_TO_TILES = {
-        0: [0, 1], 1: [0, 1, 4], 2: [0, 3, 4], 3: [0, 3], 4: [0], 5: [0],
-        6: [1, 2], 7: [1, 2, 5], 8: [1, 4, 5], 9: [1], 10: [2], 11: [2, 6],
-        12: [2, 5, 6], 13: [2],
-        14: [3, 4, 8], 15: [3, 7, 8], 16: [3, 7], 17: [3],
-        18: [4, 5, 9], 19: [4, 8, 9],
-        20: [5, 6, 10], 21: [5, 9, 10], 22: [6], 23: [6, 11], 24: [6, 10, 11],
-        25: [7, 8, 12], 26: [7, 12], 27: [7], 28: [7],
-        29: [8, 9, 13], 30: [8, 12, 13],
-        31: [9, 10, 14], 32: [9, 13, 14],
-        33: [10, 11, 15], 34: [10, 14, 15], 35: [11], 36: [11], 37: [11, 15],
-        38: [12, 13, 16], 39: [12, 16], 40: [12],
-        41: [13, 14, 17], 42: [13, 16, 17],
-        43: [14, 15, 18], 44: [14, 17, 18], 45: [15], 46: [15, 18],
-        47: [16, 17], 48: [16], 49: [16],
-        50: [17, 18], 51: [17], 52: [18], 53: [18]
-    }
+    # Exact vertex to tiles mapping (VERTEX_TO_TILES[vertex_id] -> tile_ids)
+    VERTEX_TO_TILES = (
+        (0, 1), (0, 1, 4), (0, 3, 4), (0, 3), (0,), (0,),  # 0-5
+        (1, 2), (1, 2, 5), (1, 4, 5), (1,), (2,), (2, 6),  # 6-11
+        (2, 5, 6), (2,),  # 12-13
+        (3, 4, 8), (3, 7, 8), (3, 7), (3,),  # 14-17
+        (4, 5, 9), (4, 8, 9),  # 18-19
+        (5, 6, 10), (5, 9, 10), (6,), (6, 11), (6, 10, 11),  # 20-24
+        (7, 8, 12), (7, 12), (7,), (7,),  # 25-28
+        (8, 9, 13), (8, 12, 13),  # 29-30
+        (9, 10, 14), (9, 13, 14),  # 31-32
+        (10, 11, 15), (10, 14, 15), (11,), (11,), (11, 15),  # 33-37
+        (12, 13, 16), (12, 16), (12,),  # 38-40
+        (13, 14, 17), (13, 16, 17),  # 41-42
+        (14, 15, 18), (14, 17, 18), (15,), (15, 18),  # 43-46
+        (16, 17), (16,), (16,),  # 47-49
+        (17, 18), (17,), (18,), (18,),  # 50-53
+    )
     
-    # Exact vertex neighbors mapping (for distance rule)
-    VERTEX_NEIGHBORS = {
-        0: [1, 5, 9], 1: [0, 2, 8], 2: [1, 3, 14], 3: [2, 4, 17], 4: [3, 5], 5: [0, 4],
-        6: [7, 9, 13], 7: [6, 8, 12], 8: [1, 7, 18], 9: [0, 6],
-        10: [11, 13], 11: [10, 12, 22], 12: [7, 11, 20], 13: [6, 10],
-        14: [2, 15, 19], 15: [14, 16, 25], 16: [15, 17, 28], 17: [3, 16],
-        18: [8, 19, 21], 19: [14, 18, 29], 20: [12, 21, 24], 21: [18, 20, 31],
-        22: [11, 23], 23: [22, 24, 35], 24: [20, 23, 33],
-        25: [15, 26, 30], 26: [25, 27, 40], 27: [26, 28], 28: [16, 27],
-        29: [19, 30, 32], 30: [25, 29, 38], 31: [21, 32, 34], 32: [29, 31, 41],
-        33: [24, 34, 37], 34: [31, 33, 43], 35: [23, 36], 36: [35, 37], 37: [33, 36, 45],
-        38: [30, 39, 42], 39: [38, 40, 49], 40: [26, 39],
-        41: [32, 42, 44], 42: [38, 41, 47], 43: [34, 44, 46], 44: [41, 43, 50],
-        45: [37, 46], 46: [43, 45, 52], 47: [42, 48, 51], 48: [47, 49], 49: [39, 48],
-        50: [44, 51, 53], 51: [47, 50], 52: [46, 53], 53: [50, 52]
-    }
+    # Exact vertex neighbors mapping (VERTEX_NEIGHBORS[vertex_id] -> neighbor ids, for distance rule)
+    VERTEX_NEIGHBORS = (
+        (1, 5, 9), (0, 2, 8), (1, 3, 14), (2, 4, 17), (3, 5), (0, 4),  # 0-5
+        (7, 9, 13), (6, 8, 12), (1, 7, 18), (0, 6),  # 6-9
+        (11, 13), (10, 12, 22), (7, 11, 20), (6, 10),  # 10-13
+        (2, 15, 19), (14, 16, 25), (15, 17, 28), (3, 16),  # 14-17
+        (8, 19, 21), (14, 18, 29), (12, 21, 24), (18, 20, 31),  # 18-21
+        (11, 23), (22, 24, 35), (20, 23, 33),  # 22-24
+        (15, 26, 30), (25, 27, 40), (26, 28), (16, 27),  # 25-28
+        (19, 30, 32), (25, 29, 38), (21, 32, 34), (29, 31, 41),  # 29-32
+        (24, 34, 37), (31, 33, 43), (23, 36), (35, 37), (33, 36, 45),  # 33-37
+        (30, 39, 42), (38, 40, 49), (26, 39),  # 38-40
+        (32, 42, 44), (38, 41, 47), (34, 44, 46), (41, 43, 50),  # 41-44
+        (37, 46), (43, 45, 52), (42, 48, 51), (47, 49), (39, 48),  # 45-49
+        (44, 51, 53), (47, 50), (46, 53), (50, 52),  # 50-53
+    )
+    
+    # Layout invariants shared by every board (read-only, built once at import)
+    VERTICES = tuple(range(54))  # 0-53
+    DICE_PROBABILITIES = _dice_probabilities()  # indexed by roll (0-12)
+    
+    # Bitmask forms of the mappings above, shared by every board
+    NEIGHBOR_MASK = _neighbor_masks(VERTEX_NEIGHBORS)
+    VERTEX_TILE_MASK = _tile_masks(VERTEX_TO_TILES)
+    
+    # Per-board names for the invariants. They live on the class so that
+    # constructing (or pickling) a board never copies them.
+    vertices = VERTICES
+    dice_probabilities = DICE_PROBABILITIES
+    tiles_touching = VERTEX_TO_TILES
+    vertex_neighbors = VERTEX_NEIGHBORS
     
     def __init__(self, seed: Optional[int] = None, num_players: int = 4,
-                 quality_weights: Optional[Dict[str, float]] = None):
+                 quality_weights: Optional[Union[QualityWeights, Dict[str, float]]] = None,
+                 cache_dir: Optional[str] = None):
         """
         Initialize a random Catan board.
         
         Args:
             seed: Random seed for reproducibility
             num_players: Number of players (default: 4)
-            quality_weights: Dictionary with keys 'w_resources', 'w_expected_cards', 'w_prob_at_least_one'
+            quality_weights: QualityWeights, or a dictionary with keys 'w_resources',
+                           'w_expected_cards', 'w_prob_at_least_one'
                            If None, uses default values (1/3 each)
+            cache_dir: Optional directory in which the precomputed quality
+                       matrices of seeded boards are cached across runs
         """
-        if seed is not None:
-            random.seed(seed)
+        # A seeded board draws from its own generator so that building it does
+        # not reseed the global one; unseeded boards keep using the global one
+        rng = random.Random(seed) if seed is not None else random
         
         self.num_players = num_players
         
         # Set quality weights
         if quality_weights is None:
-            self.quality_weights = {
-                'w_resources': 1/3,
-                'w_expected_cards': 1/3,
-                'w_prob_at_least_one': 1/3
-            }
-        else:
+            self.quality_weights = QualityWeights()
+        elif isinstance(quality_weights, QualityWeights):
             self.quality_weights = quality_weights
+        else:
+            self.quality_weights = QualityWeights(**quality_weights)
         
-        # Initialize dice probabilities
-        self.dice_probabilities = self._compute_dice_probabilities()
-        
-        # Create board layout (19 tiles in 3-4-5-4-3 pattern)
-        self.tiles = self._create_board_layout()
+        # Create board layout (19 tiles in 3-4-5-4-3 pattern), stored as
+        # parallel per-tile lists indexed by tile id
+        self.tile_rows, self.tile_cols = self._create_board_layout()
         
         # Assign resources randomly
-        self._assign_resources()
-        
-        # Assign number tokens randomly
-        self._assign_number_tokens()
+        self._assign_resources(rng)
         
-        # Build vertex and adjacency structures using exact mappings
-        self.vertices = list(range(54))  # 0-53
-        self.tiles_touching = self._build_tiles_touching()
-        self.vertex_neighbors = self._build_vertex_neighbors()
+        # Assign number tokens randomly (vertices, adjacency and dice
+        # probabilities are layout-independent class attributes)
+        self._assign_number_tokens(rng)
         
-        # Precompute quality matrices
-        self.single_quality = self._precompute_single_quality()
-        self.pair_quality = self._precompute_pair_quality()
-    
-    def _compute_dice_probabilities(self) -> Dict[int, float]:
-        """Compute probability of rolling each number (2-12)."""
-        probs = {}
-        for i in range(2, 13):
-            # Number of ways to roll this number with two dice
-            if i <= 7:
-                ways = i - 1
-            else:
-                ways = 13 - i
-            probs[i] = ways / 36.0
-        return probs
+        # Precompute quality matrices (or load them from the on-disk cache)
+        if cache_dir is not None and seed is not None:
+            self._load_or_precompute_quality(cache_dir, seed)
+        else:
+            self.single_quality = self._precompute_single_quality()
+            self.pair_quality_table = self._precompute_pair_quality()
+        # Vertices by single-settlement quality, best first; the sort is stable,
+        # so equally good vertices stay in ascending order
+        self.vertices_by_quality = tuple(sorted(self.vertices, key=self.single_quality.__getitem__,
+                                                reverse=True))
+        self.pair_quality_order = self._precompute_pair_order()
     
-    def _create_board_layout(self) -> List[Dict]:
+    def _create_board_layout(self) -> Tuple[List[int], List[int]]:
         """
         Create the standard Catan board layout with 19 hexagonal tiles.
         
@@ -135,10 +244,8 @@ class Board:
         Tiles are numbered 0-18
         
         Returns:
-            List of tile dictionaries with position information
+            Tuple of (tile_rows, tile_cols) lists indexed by tile id
         """
-        tiles = []
-        
         # Tile positions in rows (using the exact structure)
         # Row 0 (top): 3 tiles (0, 1, 2)
         # Row 1: 4 tiles (3, 4, 5, 6)
@@ -154,113 +261,220 @@ class Board:
             (4, 0), (4, 1), (4, 2),  # Row 4: tiles 16-18
         ]
         
-        for tile_id, (row, col) in enumerate(tile_rows):
-            tiles.append({
-                'id': tile_id,
-                'row': row,
-                'col': col,
-                'resource': None,  # Will be assigned
-                'number': None,     # Will be assigned
-            })
-        
-        return tiles
+        return [row for row, _ in tile_rows], [col for _, col in tile_rows]
     
-    def _assign_resources(self):
-        """Randomly assign resources to tiles."""
-        resources = []
-        for resource, count in self.RESOURCE_COUNTS.items():
-            resources.extend([resource] * count)
+    def _assign_resources(self, rng):
+        """
+        Randomly assign resources to tiles.
         
-        random.shuffle(resources)
+        Args:
+            rng: random.Random instance (or the random module) to shuffle with
+        """
+        resource_ids = list(self.RESOURCE_POOL)
+        rng.shuffle(resource_ids)
         
-        for i, tile in enumerate(self.tiles):
-            tile['resource'] = resources[i]
+        self.tile_resource_ids = resource_ids
     
-    def _assign_number_tokens(self):
-        """Randomly assign number tokens to resource tiles (not desert)."""
-        # Get all non-desert tiles
-        resource_tiles = [t for t in self.tiles if t['resource'] != 'desert']
+    def _assign_number_tokens(self, rng):
+        """
+        Randomly assign number tokens to resource tiles (not desert).
         
+        Args:
+            rng: random.Random instance (or the random module) to shuffle with
+        """
         # Shuffle number tokens
         tokens = self.NUMBER_TOKENS.copy()
-        random.shuffle(tokens)
+        rng.shuffle(tokens)
+        
+        # Assign tokens to resource tiles in tile order; desert has no number token
+        self.tile_numbers = []
+        self.tile_probs = []
+        next_token = 0
+        for resource_id in self.tile_resource_ids:
+            if resource_id == DESERT_ID:
+                self.tile_numbers.append(None)
+                self.tile_probs.append(0.0)
+            else:
+                number = tokens[next_token]
+                next_token += 1
+                self.tile_numbers.append(number)
+                self.tile_probs.append(self.dice_probabilities[number])
+    
+    def fingerprint(self) -> Tuple:
+        """
+        Hashable summary of everything the solver's result depends on.
         
-        # Assign tokens to resource tiles
-        for i, tile in enumerate(resource_tiles):
-            tile['number'] = tokens[i]
+        Two boards with equal fingerprints have the same tiles, number tokens,
+        quality weights and player count, and therefore the same solution.
         
-        # Desert has no number token
-        for tile in self.tiles:
-            if tile['resource'] == 'desert':
-                tile['number'] = None
+        Returns:
+            Tuple of (resource IDs, number tokens, quality weights, num_players)
+        """
+        return (tuple(self.tile_resource_ids), tuple(self.tile_numbers),
+                self.quality_weights, self.num_players)
     
-    def _build_tiles_touching(self) -> Dict[int, List[int]]:
+    @property
+    def tile_resources(self) -> List[str]:
         """
-        Build mapping from vertex to list of tile indices that touch it.
-        Uses the exact mapping provided.
+        Resource name of every tile, for display code.
         
         Returns:
-            Dictionary mapping vertex_id -> list of tile indices
+            List of resource names indexed by tile_id
         """
-        return {v: tiles.copy() for v, tiles in self.VERTEX_TO_TILES.items()}
+        return [self.RESOURCE_NAMES[resource_id] for resource_id in self.tile_resource_ids]
     
-    def _build_vertex_neighbors(self) -> Dict[int, Set[int]]:
+    @property
+    def tiles(self) -> List[Dict]:
         """
-        Build mapping from vertex to set of neighboring vertices (for distance rule).
-        Uses the exact mapping provided.
+        Per-tile dictionaries for display code.
+        
+        Built on each access from the per-tile lists (tile_rows, tile_cols,
+        tile_resource_ids, tile_numbers); modifying them does not change the board.
         
         Returns:
-            Dictionary mapping vertex_id -> set of neighboring vertex IDs
+            List of tile dictionaries with id, row, col, resource and number
+        """
+        return [
+            {
+                'id': tile_id,
+                'row': self.tile_rows[tile_id],
+                'col': self.tile_cols[tile_id],
+                'resource': self.tile_resources[tile_id],
+                'number': self.tile_numbers[tile_id],
+            }
+            for tile_id in range(len(self.tile_rows))
+        ]
+    
+    def _quality_cache_path(self, cache_dir: str, seed: int) -> str:
+        """
+        Path of the cache file for this board's quality matrices.
+        
+        The file name combines the seed with a digest of the quality weights
+        and of the quality code, so boards with different weights never share
+        an entry and code changes start a fresh cache.
+        
+        Args:
+            cache_dir: Cache directory
+            seed: Board seed
+            
+        Returns:
+            Path of the pickle file
+        """
+        weights = (self.quality_weights.w_resources,
+                   self.quality_weights.w_expected_cards,
+                   self.quality_weights.w_prob_at_least_one)
+        key = (BOARD_CACHE_VERSION, _quality_code_digest(), weights)
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        return os.path.join(cache_dir, f"board_{seed}_{digest}.pkl")
+    
+    def _load_or_precompute_quality(self, cache_dir: str, seed: int):
+        """
+        Set single_quality and pair_quality_table from the cache, computing
+        and caching them on a miss.
+        
+        Cached entries also record the tile layout they were computed for and
+        are only used if it matches this board. Unreadable entries are
+        recomputed and failing writes are ignored, so the cache never changes
+        the result.
+        
+        Args:
+            cache_dir: Cache directory (created if missing)
+            seed: Board seed
         """
-        return {v: set(neighbors) for v, neighbors in self.VERTEX_NEIGHBORS.items()}
+        path = self._quality_cache_path(cache_dir, seed)
+        layout = (self.tile_resource_ids, self.tile_numbers)
+        
+        try:
+            with open(path, 'rb') as f:
+                cached_layout, single_quality, pair_quality_table = pickle.load(f)
+            if cached_layout == layout:
+                self.single_quality = single_quality
+                self.pair_quality_table = pair_quality_table
+                return
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            pass
+        
+        self.single_quality = self._precompute_single_quality()
+        self.pair_quality_table = self._precompute_pair_quality()
+        
+        # Write to a temporary file and rename it, so that concurrent runs
+        # never read a half-written entry
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump((layout, self.single_quality, self.pair_quality_table), f,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
     
-    def _precompute_single_quality(self) -> Dict[int, float]:
+    def _precompute_single_quality(self) -> List[float]:
         """
         Precompute quality score for single settlement at each vertex.
         
         Returns:
-            Dictionary mapping vertex_id -> quality score
+            List of quality scores indexed by vertex_id
         """
-        single_quality = {}
-        
-        for vertex in self.vertices:
-            vertices_list = [vertex]
-            quality = compute_quality(
-                vertices_list, self,
-                w_resources=self.quality_weights['w_resources'],
-                w_expected_cards=self.quality_weights['w_expected_cards'],
-                w_prob_at_least_one=self.quality_weights['w_prob_at_least_one']
-            )
-            single_quality[vertex] = quality
-        
-        return single_quality
+        return compute_single_quality_table(
+            self,
+            w_resources=self.quality_weights.w_resources,
+            w_expected_cards=self.quality_weights.w_expected_cards,
+            w_prob_at_least_one=self.quality_weights.w_prob_at_least_one
+        )
     
-    def _precompute_pair_quality(self) -> Dict[int, Dict[int, Dict[int, float]]]:
+    def _precompute_pair_quality(self) -> List[List[float]]:
         """
-        Precompute quality score for each player with settlements at v1 and v2.
+        Precompute quality score for settlements at v1 and v2.
         
+        All players currently share the same quality function, so a single
+        table is computed (see compute_pair_quality_table) instead of one
+        copy per player.
+        
+        Returns:
+            Dense 54x54 matrix (list of rows) with table[v1][v2] -> quality score
+            and -inf on the diagonal
+        """
+        return compute_pair_quality_table(
+            self,
+            w_resources=self.quality_weights.w_resources,
+            w_expected_cards=self.quality_weights.w_expected_cards,
+            w_prob_at_least_one=self.quality_weights.w_prob_at_least_one
+        )
+    
+    def _precompute_pair_order(self) -> List[Tuple[int, ...]]:
+        """
+        Order each row of the pair quality table from best to worst partner.
+        
+        The best feasible partner of v1 is then the first feasible vertex in
+        its row order, usually found after a few vertices instead of a scan
+        over all of them. The sort is stable, so equally good partners stay
+        in ascending vertex order, the same one max() picks.
+        
+        Returns:
+            order[v1] -> tuple of all vertices v2 by table[v1][v2] descending
+            (v1 itself, at -inf, comes last)
+        """
+        return [tuple(sorted(self.vertices, key=row.__getitem__, reverse=True))
+                for row in self.pair_quality_table]
+    
+    def pair_quality(self, player: int, v1: int, v2: int) -> float:
+        """
+        Get precomputed quality score for player with settlements at v1 and v2.
+        
+        The player argument is kept so that player-specific preferences can be
+        added later; today every player reads the same shared table.
+        
+        Args:
+            player: Player ID (1-4)
+            v1: First vertex
+            v2: Second vertex
+            
         Returns:
-            Dictionary mapping player -> v1 -> v2 -> quality score
+            Quality score
         """
-        # For now, all players have the same quality function
-        # (in the future, we could have player-specific preferences)
-        pair_quality = {}
-        
-        for player in range(1, self.num_players + 1):
-            pair_quality[player] = {}
-            for v1 in self.vertices:
-                pair_quality[player][v1] = {}
-                for v2 in self.vertices:
-                    if v1 == v2:
-                        pair_quality[player][v1][v2] = -float('inf')
-                    else:
-                        vertices_list = [v1, v2]
-                        quality = compute_quality(
-                            vertices_list, self,
-                            w_resources=self.quality_weights['w_resources'],
-                            w_expected_cards=self.quality_weights['w_expected_cards'],
-                            w_prob_at_least_one=self.quality_weights['w_prob_at_least_one']
-                        )
-                        pair_quality[player][v1][v2] = quality
-        
-        return pair_quality
+        return self.pair_quality_table[v1][v2]
@@ -0,0 +1,84 @@
+"""
+Command-line options shared by main.py and experiment.py.
+
+Both scripts accept the same board options (number of players and quality
+weights) and the same number of worker processes; they are defined here
+once so they parse and validate alike.
+"""
+
+import argparse
+from quality import QualityWeights
+
+
+def num_players_arg(value: str) -> int:
+    """
+    Parse a number of players (2-4) for argparse.
+    
+    Args:
+        value: Command-line value
+    
+    Returns:
+        Number of players
+    """
+    try:
+        num_players = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid number of players: {value}")
+    if num_players < 2 or num_players > 4:
+        raise argparse.ArgumentTypeError(f"Number of players must be between 2 and 4. Got {num_players}")
+    return num_players
+
+
+def weights_arg(value: str) -> QualityWeights:
+    """
+    Parse quality weights "w1,w2,w3" for argparse, normalized to sum to 1.
+    
+    Args:
+        value: Command-line value
+    
+    Returns:
+        QualityWeights object
+    """
+    try:
+        weights_list = [float(w.strip()) for w in value.split(',')]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"Invalid weights format. Expected w1,w2,w3. Error: {e}")
+    if len(weights_list) != 3:
+        raise argparse.ArgumentTypeError(
+            f"Must provide exactly 3 weights (w_resources, w_expected_cards, w_prob_at_least_one). "
+            f"Got {len(weights_list)}")
+    return QualityWeights.normalized(*weights_list)
+
+
+def workers_arg(value: str) -> int:
+    """
+    Parse a number of worker processes (at least 1) for argparse.
+    
+    Args:
+        value: Command-line value
+    
+    Returns:
+        Number of workers
+    """
+    try:
+        workers = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid number of workers: {value}")
+    if workers < 1:
+        raise argparse.ArgumentTypeError(f"Number of workers must be at least 1. Got {workers}")
+    return workers
+
+
+def add_board_arguments(parser: argparse.ArgumentParser):
+    """
+    Add the --players and --weights options to a parser.
+    
+    Args:
+        parser: Parser to extend
+    """
+    parser.add_argument('-p', '--players', dest='num_players', type=num_players_arg, default=4,
+                        metavar='N', help='Number of players (2-4, default: 4)')
+    parser.add_argument('-w', '--weights', dest='quality_weights', type=weights_arg, default=None,
+                        metavar='w1,w2,w3',
+                        help='Quality function weights for resource score, expected cards and '
+                             'probability of at least one card (normalized to sum to 1)')
@@ -7,13 +7,29 @@ Compares:
 3. All prunings (feasibility + upper bound + memo)
 """
 
+import argparse
+import os
 import time
-import sys
-import threading
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from board import Board
+from cli import add_board_arguments, workers_arg
 from solver import Solver
 
 
+# Pruning configuration of one modality
+ModalitySpec = namedtuple('ModalitySpec', 'name feasibility upper_bound memo')
+
+# Modalities in command-line index order (--modalities=0,1,2)
+MODALITIES = (
+    ModalitySpec('Feasibility Pruning Only', feasibility=True, upper_bound=False, memo=False),
+    ModalitySpec('Feasibility + Memo', feasibility=True, upper_bound=False, memo=True),
+    ModalitySpec('All Prunings (Feasibility + Upper Bound + Memo)',
+                 feasibility=True, upper_bound=True, memo=True),
+)
+
+
 class ExperimentSolver(Solver):
     """
     Extension of Solver to allow different pruning modalities.
@@ -42,13 +58,118 @@ class ExperimentSolver(Solver):
     
     def get_elapsed_time(self):
         """Get elapsed time in seconds."""
-        if self.end_time and self.start_time:
+        if self.end_time is not None and self.start_time is not None:
             return self.end_time - self.start_time
         return 0.0
 
 
+# Boards of the running experiment, indexed by board number. Set once per
+# process (by run_experiment, or by _init_worker in pool workers) so that tasks
+# only carry a board number instead of a pickled board.
+_boards = []
+
+
+def _init_worker(worker_counter, boards):
+    """
+    Set up a pool worker process: receive the boards and pin to a CPU core.
+    
+    The boards are pickled once per worker here instead of once per task.
+    Each worker then takes the next index from the shared counter and binds
+    itself to that core of the cores this process may run on (Linux only), so
+    workers do not migrate between cores and compete for the same caches.
+    
+    Args:
+        worker_counter: multiprocessing.Value shared by all workers of the pool
+        boards: List of the experiment's boards
+    """
+    global _boards
+    _boards = boards
+    
+    if not hasattr(os, 'sched_setaffinity'):
+        return  # Not supported on this platform (e.g. macOS, Windows)
+    
+    with worker_counter.get_lock():
+        worker_id = worker_counter.value
+        worker_counter.value += 1
+    
+    cores = sorted(os.sched_getaffinity(0))
+    try:
+        os.sched_setaffinity(0, {cores[worker_id % len(cores)]})
+    except OSError:
+        pass  # Pinning is only an optimization
+
+
+# Solvers already built in this process, one per modality, reused via reset()
+_solvers = {}
+
+
+def _solve_board(task):
+    """
+    Solve one board with one modality.
+    
+    Module-level so that it can run in a worker process.
+    
+    Args:
+        task: Tuple of (board_num, modality, time_limit, known); the board is
+              read from this process's _boards, and known is the (quality,
+              positions) another modality already found on it, or None
+        
+    Returns:
+        Dictionary with board_num, board_fingerprint, status ('ok', 'timeout',
+        'no_solution' or 'error'), elapsed and, when solved, positions, quality and
+        recursive_calls (or error, for 'error')
+    """
+    board_num, modality, time_limit, known = task
+    board = _boards[board_num]
+    result = {'board_num': board_num, 'board_fingerprint': board.fingerprint(),
+              'status': 'ok', 'elapsed': 0.0}
+    
+    try:
+        # Reuse this process's solver for the modality, or create it
+        solver = _solvers.get(modality)
+        if solver is None:
+            solver = ExperimentSolver(
+                board,
+                enable_feasibility=modality.feasibility,
+                enable_upper_bound=modality.upper_bound,
+                enable_memo=modality.memo
+            )
+            _solvers[modality] = solver
+        else:
+            solver.reset(board)
+        if known is not None:
+            # Verify the known quality, trying its placement first
+            solver.alpha_cutoff, solver.best_root_move = known
+        
+        # Run with a cooperative time limit: the solver polls the
+        # deadline itself and raises TimeoutError, so nothing keeps
+        # running in the background after a timeout
+        start = time.perf_counter()
+        final_state, positions, quality = solver.solve(time_limit=time_limit)
+    except TimeoutError:
+        result['status'] = 'timeout'
+        result['elapsed'] = time.perf_counter() - start
+        return result
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+        return result
+    
+    result['elapsed'] = time.perf_counter() - start
+    
+    if final_state is None or positions is None:
+        result['status'] = 'no_solution'
+        return result
+    
+    result['positions'] = positions
+    result['quality'] = quality
+    result['recursive_calls'] = solver.recursive_calls
+    return result
+
+
 def run_experiment(num_boards=10, time_limit=25.0, modalities_to_test=None,
-                  num_players=4, quality_weights=None):
+                  num_players=4, quality_weights=None, board_cache_dir=None,
+                  workers=1, carry_bounds=False):
     """
     Run experiment comparing different pruning modalities.
     
@@ -57,35 +178,26 @@ def run_experiment(num_boards=10, time_limit=25.0, modalities_to_test=None,
         time_limit: Maximum time per execution in seconds
         modalities_to_test: List of modality indices to test (0=feasibility only, 1=feasibility+memo, 2=all)
                           If None, tests all 3 modalities
+        board_cache_dir: Optional directory for caching precomputed boards across runs
+        workers: Number of processes solving boards in parallel (1 = serial)
+        carry_bounds: Pass the quality and positions an earlier modality found
+                      on a board to the later modalities, as an alpha cutoff
+                      and a first move to try. They then only verify that
+                      value instead of searching independently, so list the
+                      fastest modality first (e.g. 2,1,0) and read their times
+                      as verification times.
     """
     print("=" * 80)
     print("EXPERIMENT: Comparison of Pruning Modalities")
     print("=" * 80)
     print(f"Generating {num_boards} boards and evaluating each with the 3 modalities")
     print(f"Time limit per execution: {time_limit} seconds")
+    if carry_bounds:
+        print("Carrying bounds: later modalities verify the quality of the first one")
     print()
     
     # Modalities to test
-    modalities = [
-        {
-            'name': 'Feasibility Pruning Only',
-            'feasibility': True,
-            'upper_bound': False,
-            'memo': False
-        },
-        {
-            'name': 'Feasibility + Memo',
-            'feasibility': True,
-            'upper_bound': False,
-            'memo': True
-        },
-        {
-            'name': 'All Prunings (Feasibility + Upper Bound + Memo)',
-            'feasibility': True,
-            'upper_bound': True,
-            'memo': True
-        }
-    ]
+    modalities = MODALITIES
     
     # Filter modalities if specified
     if modalities_to_test is not None:
@@ -99,23 +211,49 @@ def run_experiment(num_boards=10, time_limit=25.0, modalities_to_test=None,
     print("Generating boards...")
     print(f"  Configuration: {num_players} players")
     if quality_weights:
-        print(f"  Quality weights: resources={quality_weights['w_resources']:.3f}, "
-              f"expected_cards={quality_weights['w_expected_cards']:.3f}, "
-              f"prob_at_least_one={quality_weights['w_prob_at_least_one']:.3f}")
+        print(f"  Quality weights: resources={quality_weights.w_resources:.3f}, "
+              f"expected_cards={quality_weights.w_expected_cards:.3f}, "
+              f"prob_at_least_one={quality_weights.w_prob_at_least_one:.3f}")
     boards = []
     for board_num in range(num_boards):
         seed = board_num  # Use board number as seed for reproducibility
-        board = Board(seed=seed, num_players=num_players, quality_weights=quality_weights)
+        board = Board(seed=seed, num_players=num_players, quality_weights=quality_weights,
+                      cache_dir=board_cache_dir)
         boards.append(board)
         print(f"  Board {board_num} generated (seed={seed})")
     print()
     
     results = {}
     
+    # Serial runs read the boards from this process's _boards
+    global _boards
+    _boards = boards
+    
+    # (quality, positions) found on each board by an earlier modality
+    # (only with carry_bounds)
+    known_solutions = {}
+    
+    # Every (modality, board) run is independent. With several workers, all of
+    # them are submitted up front so the pool stays busy across modalities;
+    # results are still reported per modality in board order. Carried bounds
+    # are only known once the previous modality is done, so then each
+    # modality is submitted when its turn comes.
+    executor = None
+    pending = []
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(multiprocessing.Value('i', 0), boards))
+        if not carry_bounds:
+            for modality in modalities:
+                pending.append([
+                    executor.submit(_solve_board, (board_num, modality, time_limit, None))
+                    for board_num in range(len(boards))
+                ])
+    
     # SECOND: Evaluate each modality on the same boards
-    for modality in modalities:
+    for modality_idx, modality in enumerate(modalities):
         print(f"\n{'='*80}")
-        print(f"Modality: {modality['name']}")
+        print(f"Modality: {modality.name}")
         print(f"{'='*80}")
         
         times = []
@@ -123,92 +261,78 @@ def run_experiment(num_boards=10, time_limit=25.0, modalities_to_test=None,
         successful = 0
         solutions = []  # Store solutions for comparison: (positions, quality)
         
-        for board_num, board in enumerate(boards):
-            try:
-                # Create solver with this modality
-                solver = ExperimentSolver(
-                    board,
-                    enable_feasibility=modality['feasibility'],
-                    enable_upper_bound=modality['upper_bound'],
-                    enable_memo=modality['memo']
-                )
-                
-                # Run with timeout using threading
-                result_container = {'result': None, 'exception': None, 'completed': False}
-                
-                def solve_wrapper():
-                    try:
-                        result_container['result'] = solver.solve()
-                        result_container['completed'] = True
-                    except Exception as e:
-                        result_container['exception'] = e
-                        result_container['completed'] = True
-                
-                # Start solver in a thread
-                start = time.time()
-                thread = threading.Thread(target=solve_wrapper)
-                thread.daemon = True
-                thread.start()
-                thread.join(timeout=time_limit)
-                
-                elapsed = time.time() - start
-                
-                # Check if timeout occurred
-                if thread.is_alive():
-                    print(f"  Board {board_num}: TIMEOUT ({elapsed:.2f}s > {time_limit}s) - Execution interrupted")
-                    timeouts += 1
-                    continue
-                
-                # Check for exceptions
-                if result_container['exception']:
-                    print(f"  Board {board_num}: ERROR - {result_container['exception']}")
-                    continue
-                
-                # Get result
-                final_state, positions, quality = result_container['result']
-                
-                if final_state is None or positions is None:
-                    print(f"  Board {board_num}: ERROR - No solution found")
-                    continue
-                
-                times.append(elapsed)
-                successful += 1
-                
-                # Store solution for comparison
-                solutions.append({
-                    'board_num': board_num,
-                    'positions': positions,
-                    'quality': quality,
-                    'final_state': final_state,
-                    'recursive_calls': solver.recursive_calls
-                })
-                
-                print(f"  Board {board_num}: {elapsed:.4f}s - "
-                      f"Positions: {positions}, Objective value player one: {quality:.4f} - "
-                      f"Recursive calls: {solver.recursive_calls:,}")
-                
-            except Exception as e:
-                print(f"  Board {board_num}: ERROR - {e}")
+        # Running statistics over the successful boards
+        total_time = 0.0
+        min_time = float('inf')
+        max_time = 0.0
+        total_recursive_calls = 0
+        
+        if executor is not None:
+            if carry_bounds:
+                pending.append([
+                    executor.submit(_solve_board, (board_num, modality, time_limit,
+                                                   known_solutions.get(board_num)))
+                    for board_num in range(len(boards))
+                ])
+            board_results = (future.result() for future in pending[modality_idx])
+        else:
+            board_results = (_solve_board((board_num, modality, time_limit,
+                                           known_solutions.get(board_num)))
+                             for board_num in range(len(boards)))
+        
+        # Results arrive in board order, also when solved in parallel
+        for board_result in board_results:
+            board_num = board_result['board_num']
+            status = board_result['status']
+            elapsed = board_result['elapsed']
+            
+            if status == 'timeout':
+                print(f"  Board {board_num}: TIMEOUT ({elapsed:.2f}s > {time_limit}s) - Execution interrupted")
+                timeouts += 1
+                continue
+            
+            if status == 'error':
+                print(f"  Board {board_num}: ERROR - {board_result['error']}")
+                continue
+            
+            if status == 'no_solution':
+                print(f"  Board {board_num}: ERROR - No solution found")
                 continue
+            
+            times.append(elapsed)
+            successful += 1
+            total_time += elapsed
+            min_time = min(min_time, elapsed)
+            max_time = max(max_time, elapsed)
+            total_recursive_calls += board_result['recursive_calls']
+            if carry_bounds:
+                known_solutions.setdefault(board_num, (board_result['quality'],
+                                                       board_result['positions']))
+            
+            # Store solution for comparison
+            solutions.append({
+                'board_num': board_num,
+                'board_fingerprint': board_result['board_fingerprint'],
+                'positions': board_result['positions'],
+                'quality': board_result['quality'],
+                'recursive_calls': board_result['recursive_calls']
+            })
+            
+            print(f"  Board {board_num}: {elapsed:.4f}s - "
+                  f"Positions: {board_result['positions']}, Objective value player one: {board_result['quality']:.4f} - "
+                  f"Recursive calls: {board_result['recursive_calls']:,}")
         
         # Calculate statistics
-        if times:
-            avg_time = sum(times) / len(times)
-            min_time = min(times)
-            max_time = max(times)
+        if successful:
+            avg_time = total_time / successful
+            avg_recursive_calls = total_recursive_calls / successful
         else:
             avg_time = float('inf')
             min_time = float('inf')
             max_time = float('inf')
-        
-        # Calculate average recursive calls
-        recursive_calls_list = [sol['recursive_calls'] for sol in solutions]
-        if recursive_calls_list:
-            avg_recursive_calls = sum(recursive_calls_list) / len(recursive_calls_list)
-        else:
             avg_recursive_calls = 0
         
-        results[modality['name']] = {
+        results[modality.name] = {
             'times': times,
             'avg_time': avg_time,
             'min_time': min_time,
@@ -230,6 +354,9 @@ def run_experiment(num_boards=10, time_limit=25.0, modalities_to_test=None,
         else:
             print(f"    Average time: N/A (no successful executions)")
     
+    if executor is not None:
+        executor.shutdown()
+    
     # Print final comparison
     print("\n" + "=" * 80)
     print("COMPARATIVE SUMMARY")
@@ -263,45 +390,46 @@ def run_experiment(num_boards=10, time_limit=25.0, modalities_to_test=None,
         print("=" * 80)
         print()
         
-        # Get all modality names
+        # Solutions of each modality by board, in modality order; the first
+        # modality is the reference the others are compared against
         modality_names = list(results.keys())
+        solutions_by_board = [
+            {sol['board_num']: sol for sol in result['solutions']}
+            for result in results.values()
+        ]
+        ref_mod = modality_names[0]
+        ref_solutions = solutions_by_board[0]
         
         # Compare solutions board by board
         all_boards_same = True
         quality_differences = []
         
-        # Find common boards (boards that were solved by all modalities)
-        all_solutions = {}
-        for mod_name, result in results.items():
-            for sol in result['solutions']:
-                board_num = sol['board_num']
-                if board_num not in all_solutions:
-                    all_solutions[board_num] = {}
-                all_solutions[board_num][mod_name] = sol
+        # Only boards solved by every modality are compared
+        common_boards = sorted(
+            board_num for board_num in ref_solutions
+            if all(board_num in by_board for by_board in solutions_by_board[1:])
+        )
         
-        # Compare each board
-        for board_num in sorted(all_solutions.keys()):
-            board_solutions = all_solutions[board_num]
-            
-            # Check if all modalities solved this board
-            if len(board_solutions) < len(modality_names):
-                continue  # Skip if not all modalities solved it
-            
-            # Get first modality as reference
-            ref_mod = modality_names[0]
-            ref_sol = board_solutions[ref_mod]
+        for board_num in common_boards:
+            ref_sol = ref_solutions[board_num]
             ref_positions = ref_sol['positions']
             ref_quality = ref_sol['quality']
             
             # Compare with other modalities
             board_matches = True
-            for mod_name in modality_names[1:]:
-                if mod_name not in board_solutions:
-                    continue
-                other_sol = board_solutions[mod_name]
+            for mod_name, by_board in zip(modality_names[1:], solutions_by_board[1:]):
+                other_sol = by_board[board_num]
                 other_positions = other_sol['positions']
                 other_quality = other_sol['quality']
                 
+                # Both modalities must have solved the same board, whatever
+                # order (or process) the results came from
+                if other_sol['board_fingerprint'] != ref_sol['board_fingerprint']:
+                    print(f"  Board {board_num}: BOARD MISMATCH! {ref_mod} and {mod_name} solved different boards")
+                    board_matches = False
+                    all_boards_same = False
+                    continue
+                
                 # Compare positions (should be same)
                 if ref_positions != other_positions:
                     print(f"  Board {board_num}: POSITION MISMATCH!")
@@ -339,97 +467,57 @@ def run_experiment(num_boards=10, time_limit=25.0, modalities_to_test=None,
         print()
         
         # Calculate speedup
-        baseline = results[modalities[0]['name']]
+        baseline = results[modalities[0].name]
         if baseline['times']:
             baseline_avg = baseline['avg_time']
             
             print("Speedup relative to first modality:")
             for modality_name, result in results.items():
-                if modality_name != modalities[0]['name'] and result['times']:
+                if modality_name != modalities[0].name and result['times']:
                     speedup = baseline_avg / result['avg_time']
                     print(f"  {modality_name}: {speedup:.2f}x faster")
     
     return results
 
 
+def modalities_arg(value: str) -> list:
+    """Parse a comma-separated list of modality indices for argparse."""
+    try:
+        return [int(x.strip()) for x in value.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid modality selection: {value}")
+
+
 if __name__ == "__main__":
     # Parse command line arguments
-    num_boards = 10
-    time_limit = 25.0
-    modalities_to_test = None
-    
-    if len(sys.argv) > 1:
-        try:
-            num_boards = int(sys.argv[1])
-        except ValueError:
-            print(f"Invalid number of boards: {sys.argv[1]}. Using default: 10")
-    
-    if len(sys.argv) > 2:
-        try:
-            time_limit = float(sys.argv[2])
-        except ValueError:
-            print(f"Invalid time limit: {sys.argv[2]}. Using default: 25.0")
-    
-    # Parse modality selection (--modalities 0,1,2 or --modalities 0,2)
-    if len(sys.argv) > 3:
-        if sys.argv[3].startswith('--modalities='):
-            mod_str = sys.argv[3].split('=', 1)[1]
-        elif sys.argv[3] == '--modalities' and len(sys.argv) > 4:
-            mod_str = sys.argv[4]
-        else:
-            mod_str = None
-        
-        if mod_str:
-            try:
-                modalities_to_test = [int(x.strip()) for x in mod_str.split(',')]
-                print(f"Selected modalities: {modalities_to_test}")
-                print("  0 = Feasibility Pruning Only")
-                print("  1 = Feasibility + Memo")
-                print("  2 = All Prunings")
-                print()
-            except ValueError:
-                print(f"Invalid modality selection: {mod_str}. Using all modalities.")
-                modalities_to_test = None
-    
-    # Parse additional arguments (players and weights)
-    num_players = 4
-    quality_weights = None
-    
-    for i in range(3, len(sys.argv)):
-        arg = sys.argv[i]
-        if arg.startswith('--players=') or arg.startswith('-p='):
-            try:
-                num_players = int(arg.split('=', 1)[1])
-                if num_players < 2 or num_players > 4:
-                    print(f"Error: Number of players must be between 2 and 4. Got {num_players}")
-                    sys.exit(1)
-            except ValueError:
-                print(f"Error: Invalid number of players: {arg.split('=', 1)[1]}")
-                sys.exit(1)
-        elif arg.startswith('--weights=') or arg.startswith('-w='):
-            try:
-                weights_str = arg.split('=', 1)[1]
-                weights_list = [float(w.strip()) for w in weights_str.split(',')]
-                if len(weights_list) != 3:
-                    print(f"Error: Must provide exactly 3 weights. Got {len(weights_list)}")
-                    sys.exit(1)
-                quality_weights = {
-                    'w_resources': weights_list[0],
-                    'w_expected_cards': weights_list[1],
-                    'w_prob_at_least_one': weights_list[2]
-                }
-                # Normalize weights
-                total = sum(weights_list)
-                if total > 0:
-                    quality_weights['w_resources'] /= total
-                    quality_weights['w_expected_cards'] /= total
-                    quality_weights['w_prob_at_least_one'] /= total
-            except ValueError as e:
-                print(f"Error: Invalid weights format. Expected --weights=w1,w2,w3. Error: {e}")
-                sys.exit(1)
+    parser = argparse.ArgumentParser(description="Compare the pruning modalities of the solver on several boards.")
+    parser.add_argument('num_boards', type=int, nargs='?', default=10,
+                        help='Number of boards to test (default: 10)')
+    parser.add_argument('time_limit', type=float, nargs='?', default=25.0,
+                        help='Maximum time per execution in seconds (default: 25.0)')
+    parser.add_argument('--modalities', dest='modalities_to_test', type=modalities_arg, default=None,
+                        metavar='X,Y', help='Modalities to test: 0 = Feasibility Pruning Only, '
+                                            '1 = Feasibility + Memo, 2 = All Prunings (default: all)')
+    add_board_arguments(parser)
+    parser.add_argument('--board-cache', dest='board_cache_dir', nargs='?', const='.board_cache',
+                        default=None, metavar='DIR',
+                        help='Cache precomputed boards on disk (default directory: .board_cache)')
+    parser.add_argument('-j', '--workers', type=workers_arg, default=1, metavar='N',
+                        help='Solve the runs in N parallel processes (default: 1, serial)')
+    parser.add_argument('--carry-bounds', action='store_true',
+                        help='Pass the quality found by the first modality to the later ones')
+    args = parser.parse_intermixed_args()
+    
+    if args.modalities_to_test is not None:
+        print(f"Selected modalities: {args.modalities_to_test}")
+        print("  0 = Feasibility Pruning Only")
+        print("  1 = Feasibility + Memo")
+        print("  2 = All Prunings")
+        print()
     
     # Run experiment
-    results = run_experiment(num_boards=num_boards, time_limit=time_limit, 
-                            modalities_to_test=modalities_to_test,
-                            num_players=num_players, quality_weights=quality_weights)
-
+    results = run_experiment(num_boards=args.num_boards, time_limit=args.time_limit,
+                            modalities_to_test=args.modalities_to_test,
+                            num_players=args.num_players, quality_weights=args.quality_weights,
+                            board_cache_dir=args.board_cache_dir, workers=args.workers,
+                            carry_bounds=args.carry_bounds)
@@ -4,77 +4,33 @@ Main entry point for Catan optimal settlement placement solver.
 Initializes a random board, runs the solver, and displays results.
 """
 
-import sys
+import argparse
 from board import Board
+from cli import add_board_arguments, workers_arg
 from solver import Solver
-from visualization_gui import visualize_board_gui
 
 
 def main():
     """Main function to run the solver."""
     # Parse command line arguments
-    seed = None
-    compare_no_pruning = False
-    save_image = None
-    num_players = 4
-    quality_weights = None
+    parser = argparse.ArgumentParser(description="Find optimal initial settlement placements on a random Catan board.")
+    parser.add_argument('seed', type=int, nargs='?', default=None,
+                        help='Optional random seed for reproducibility')
+    parser.add_argument('-c', '--compare', '-n', '--no-pruning', dest='compare_no_pruning',
+                        action='store_true', help='Also run without pruning for comparison')
+    parser.add_argument('-s', '--save', dest='save_image', metavar='PATH',
+                        help='Save visualization to file')
+    add_board_arguments(parser)
+    parser.add_argument('-j', '--workers', type=workers_arg, default=1, metavar='N',
+                        help='Search player 1\'s first settlements of the comparison run without pruning '
+                             '(-c) in N parallel processes (default: 1)')
+    args = parser.parse_intermixed_args()
     
-    if len(sys.argv) > 1:
-        for arg in sys.argv[1:]:
-            if arg in ["--no-pruning", "-n", "--compare", "-c"]:
-                compare_no_pruning = True
-            elif arg.startswith("--save="):
-                save_image = arg.split("=", 1)[1]
-            elif arg.startswith("-s="):
-                save_image = arg.split("=", 1)[1]
-            elif arg.startswith("--players=") or arg.startswith("-p="):
-                try:
-                    num_players = int(arg.split("=", 1)[1])
-                    if num_players < 2 or num_players > 4:
-                        print(f"Error: Number of players must be between 2 and 4. Got {num_players}")
-                        return
-                except ValueError:
-                    print(f"Error: Invalid number of players: {arg.split('=', 1)[1]}")
-                    return
-            elif arg.startswith("--weights=") or arg.startswith("-w="):
-                try:
-                    weights_str = arg.split("=", 1)[1]
-                    weights_list = [float(w.strip()) for w in weights_str.split(",")]
-                    if len(weights_list) != 3:
-                        print(f"Error: Must provide exactly 3 weights (w_resources, w_expected_cards, w_prob_at_least_one). Got {len(weights_list)}")
-                        return
-                    quality_weights = {
-                        'w_resources': weights_list[0],
-                        'w_expected_cards': weights_list[1],
-                        'w_prob_at_least_one': weights_list[2]
-                    }
-                    # Normalize weights (optional, but good practice)
-                    total = sum(weights_list)
-                    if total > 0:
-                        quality_weights['w_resources'] /= total
-                        quality_weights['w_expected_cards'] /= total
-                        quality_weights['w_prob_at_least_one'] /= total
-                except ValueError as e:
-                    print(f"Error: Invalid weights format. Expected --weights=w1,w2,w3. Error: {e}")
-                    return
-            elif arg in ["--help", "-h"]:
-                print("Usage: python main.py [seed] [options]")
-                print("  seed: Optional random seed for reproducibility")
-                print("  --compare, -c: Also run without pruning for comparison")
-                print("  --save=path.png, -s=path.png: Save visualization to file")
-                print("  --players=N, -p=N: Number of players (2-4, default: 4)")
-                print("  --weights=w1,w2,w3, -w=w1,w2,w3: Quality function weights")
-                print("     w1 = weight for resource score")
-                print("     w2 = weight for expected cards")
-                print("     w3 = weight for probability at least one")
-                print("     (weights will be normalized to sum to 1)")
-                return
-            else:
-                try:
-                    seed = int(arg)
-                except ValueError:
-                    print(f"Unknown argument: {arg}. Use --help for usage.")
-                    return
+    seed = args.seed
+    compare_no_pruning = args.compare_no_pruning
+    save_image = args.save_image
+    num_players = args.num_players
+    quality_weights = args.quality_weights
     
     print("Initializing Catan board...")
     board = Board(seed=seed, num_players=num_players, quality_weights=quality_weights)
@@ -127,6 +83,8 @@ def main():
     # Visualize the board (GUI)
     print("\nGenerating graphical visualization...")
     try:
+        # Imported here: matplotlib is slow to load and only needed at this point
+        from visualization_gui import visualize_board_gui
         visualize_board_gui(board, final_state, save_path=save_image)
     except ImportError:
         print("Warning: matplotlib not available. Install with: pip install matplotlib")
@@ -143,7 +101,7 @@ def main():
         print("This will take significantly longer...")
         print()
         
-        solver_no_pruning = Solver(board, enable_pruning=False)
+        solver_no_pruning = Solver(board, enable_pruning=False, workers=args.workers)
         final_state_np, player1_positions_np, player1_quality_np = solver_no_pruning.solve()
         
         if final_state_np is not None and player1_positions_np is not None:
@@ -174,7 +132,7 @@ def main():
             
             print(f"Time with pruning:    {metrics['elapsed_time_seconds']:.4f} seconds")
             print(f"Time without pruning: {metrics_np['elapsed_time_seconds']:.4f} seconds")
-            if metrics_np['elapsed_time_seconds'] > 0:
+            if metrics['elapsed_time_seconds'] > 0:
                 speedup = metrics_np['elapsed_time_seconds'] / metrics['elapsed_time_seconds']
                 print(f"Speedup: {speedup:.2f}x faster with pruning")
             print()
@@ -7,8 +7,39 @@ Computes three components:
 3. Probability at least one: Probability of getting at least one resource in a turn
 """
 
-from typing import Set, List
-from collections import Counter
+from dataclasses import dataclass
+from typing import Set, List, Dict, FrozenSet, Tuple
+
+
+@dataclass(frozen=True)
+class QualityWeights:
+    """
+    Weights of the three quality components (immutable, shared by all boards).
+    """
+    w_resources: float = 1/3
+    w_expected_cards: float = 1/3
+    w_prob_at_least_one: float = 1/3
+    
+    @classmethod
+    def normalized(cls, w_resources: float, w_expected_cards: float,
+                   w_prob_at_least_one: float) -> "QualityWeights":
+        """
+        Build weights scaled to sum to 1 (left unchanged if they sum to 0 or less).
+        
+        Args:
+            w_resources: Weight for resource score component
+            w_expected_cards: Weight for expected cards component
+            w_prob_at_least_one: Weight for probability at least one component
+            
+        Returns:
+            QualityWeights instance
+        """
+        total = sum((w_resources, w_expected_cards, w_prob_at_least_one))
+        if total > 0:
+            w_resources /= total
+            w_expected_cards /= total
+            w_prob_at_least_one /= total
+        return cls(w_resources, w_expected_cards, w_prob_at_least_one)
 
 
 def resource_score(vertices: List[int], board) -> float:
@@ -26,12 +57,13 @@ def resource_score(vertices: List[int], board) -> float:
         return 0.0
     
     # Collect all resource types from tiles adjacent to these vertices
+    desert_id = board.DESERT_ID
     resource_types = set()
     for vertex in vertices:
         for tile_idx in board.tiles_touching[vertex]:
-            tile = board.tiles[tile_idx]
-            if tile['resource'] != 'desert':  # Desert doesn't produce resources
-                resource_types.add(tile['resource'])
+            resource_id = board.tile_resource_ids[tile_idx]
+            if resource_id != desert_id:  # Desert doesn't produce resources
+                resource_types.add(resource_id)
     
     # Count distinct resource types (diversity)
     num_types = len(resource_types)
@@ -40,7 +72,7 @@ def resource_score(vertices: List[int], board) -> float:
     total_tiles = sum(
         1 for vertex in vertices
         for tile_idx in board.tiles_touching[vertex]
-        if board.tiles[tile_idx]['resource'] != 'desert'
+        if board.tile_resource_ids[tile_idx] != desert_id
     )
     
     # Weighted combination: diversity + coverage
@@ -69,29 +101,29 @@ def expected_cards(vertices: List[int], board) -> float:
     
     expected = 0.0
     
-    # Track tiles we've already counted (to avoid double-counting if two vertices touch same tile)
-    counted_tiles = set()
+    # Track tiles we've already counted (to avoid double-counting if two vertices touch same tile),
+    # as a bitmask over the 19 tile indices
+    counted_tiles = 0
     
     for vertex in vertices:
         for tile_idx in board.tiles_touching[vertex]:
-            if tile_idx in counted_tiles:
+            tile_bit = 1 << tile_idx
+            if counted_tiles & tile_bit:
                 continue
             
-            tile = board.tiles[tile_idx]
-            if tile['resource'] == 'desert':
+            if board.tile_resource_ids[tile_idx] == board.DESERT_ID:
                 continue
             
-            number_token = tile['number']
-            if number_token is None:
+            if board.tile_numbers[tile_idx] is None:
                 continue
             
-            # Probability of rolling this number
-            prob = board.dice_probabilities.get(number_token, 0.0)
+            # Probability of rolling this tile's number
+            prob = board.tile_probs[tile_idx]
             
             # Each tile produces 1 resource when its number is rolled
             expected += prob * 1.0
             
-            counted_tiles.add(tile_idx)
+            counted_tiles |= tile_bit
     
     return expected
 
@@ -113,19 +145,19 @@ def prob_at_least_one(vertices: List[int], board) -> float:
     if not vertices:
         return 0.0
     
-    # Collect all tiles and their numbers
-    tile_numbers = []
+    # Collect the number tokens of all producing tiles as a bitmask
+    # (bit n set iff some tile has number n); only membership matters
+    number_mask = 0
     for vertex in vertices:
         for tile_idx in board.tiles_touching[vertex]:
-            tile = board.tiles[tile_idx]
-            if tile['resource'] == 'desert':
+            if board.tile_resource_ids[tile_idx] == board.DESERT_ID:
                 continue
-            number_token = tile['number']
+            number_token = board.tile_numbers[tile_idx]
             if number_token is None:
                 continue
-            tile_numbers.append(number_token)
+            number_mask |= 1 << number_token
     
-    if not tile_numbers:
+    if not number_mask:
         return 0.0
     
     # Use complement: P(at least one) = 1 - P(none)
@@ -133,17 +165,14 @@ def prob_at_least_one(vertices: List[int], board) -> float:
     # But we need to be careful: if multiple tiles have the same number,
     # rolling that number gives resources from all of them
     
-    # Group by number token
-    number_counts = Counter(tile_numbers)
-    
     # For each possible roll (2-12), compute probability of NOT getting any resource
     prob_no_resource = 0.0
     
+    dice_probabilities = board.dice_probabilities
     for roll in range(2, 13):
-        prob_roll = board.dice_probabilities.get(roll, 0.0)
-        if roll not in number_counts:
+        if not (number_mask >> roll) & 1:
             # This roll doesn't give us any resources, so it contributes to "no resource"
-            prob_no_resource += prob_roll
+            prob_no_resource += dice_probabilities[roll]
     
     # The complement gives us probability of getting at least one resource
     prob_at_least_one = 1.0 - prob_no_resource
@@ -151,6 +180,63 @@ def prob_at_least_one(vertices: List[int], board) -> float:
     return prob_at_least_one
 
 
+def compute_quality_components(vertices: List[int], board) -> Tuple[float, float, float]:
+    """
+    Resource score, expected cards and probability of at least one resource,
+    from a single walk over the tiles adjacent to the settlements.
+    
+    Gives the same values as resource_score, expected_cards and
+    prob_at_least_one, which each walk the same tiles separately.
+    
+    Args:
+        vertices: List of vertex indices where settlements are placed
+        board: Board object with dice probabilities and tile information
+        
+    Returns:
+        Tuple of (resource score, expected cards, probability at least one)
+    """
+    if not vertices:
+        return 0.0, 0.0, 0.0
+    
+    desert_id = board.DESERT_ID
+    resource_types = set()
+    total_tiles = 0
+    expected = 0.0
+    counted_tiles = 0  # Bitmask of tiles already added to expected
+    number_mask = 0  # Bit n set iff some producing tile has number n
+    
+    for vertex in vertices:
+        for tile_idx in board.tiles_touching[vertex]:
+            resource_id = board.tile_resource_ids[tile_idx]
+            if resource_id == desert_id:
+                continue
+            resource_types.add(resource_id)
+            total_tiles += 1
+            
+            number_token = board.tile_numbers[tile_idx]
+            if number_token is None:
+                continue
+            number_mask |= 1 << number_token
+            
+            tile_bit = 1 << tile_idx
+            if not counted_tiles & tile_bit:
+                expected += board.tile_probs[tile_idx] * 1.0
+                counted_tiles |= tile_bit
+    
+    res_score = len(resource_types) * 2.0 + total_tiles * 0.5
+    
+    if not number_mask:
+        return res_score, expected, 0.0
+    
+    prob_no_resource = 0.0
+    dice_probabilities = board.dice_probabilities
+    for roll in range(2, 13):
+        if not (number_mask >> roll) & 1:
+            prob_no_resource += dice_probabilities[roll]
+    
+    return res_score, expected, 1.0 - prob_no_resource
+
+
 def compute_quality(vertices: List[int], board, 
                    w_resources: float = 1/3,
                    w_expected_cards: float = 1/3,
@@ -168,9 +254,7 @@ def compute_quality(vertices: List[int], board,
     Returns:
         Combined quality score
     """
-    res_score = resource_score(vertices, board)
-    exp_cards = expected_cards(vertices, board)
-    prob_one = prob_at_least_one(vertices, board)
+    res_score, exp_cards, prob_one = compute_quality_components(vertices, board)
     
     benefit = (w_resources * res_score +
                w_expected_cards * exp_cards +
@@ -178,3 +262,185 @@ def compute_quality(vertices: List[int], board,
     
     return benefit
 
+
+
+def _vertex_production(vertex: int, board) -> Tuple[Tuple[Tuple[int, float], ...], FrozenSet[int], FrozenSet[int]]:
+    """
+    Resolve the producing tiles adjacent to a single vertex.
+    
+    Args:
+        vertex: Vertex index
+        board: Board object with tile information
+        
+    Returns:
+        Tuple of ((tile_idx, roll probability) pairs, resource IDs, number tokens),
+        with the desert and tiles without a number token already filtered out
+    """
+    desert_id = board.DESERT_ID
+    tiles = []
+    resources = set()
+    numbers = set()
+    for tile_idx in board.tiles_touching[vertex]:
+        resource_id = board.tile_resource_ids[tile_idx]
+        if resource_id == desert_id:
+            continue
+        number_token = board.tile_numbers[tile_idx]
+        if number_token is None:
+            continue
+        tiles.append((tile_idx, board.tile_probs[tile_idx]))
+        resources.add(resource_id)
+        numbers.add(number_token)
+    return tuple(tiles), frozenset(resources), frozenset(numbers)
+
+
+def _vertex_summaries(board) -> Tuple[List[Tuple[Tuple[Tuple[int, float], ...], FrozenSet[int], FrozenSet[int]]], List[float]]:
+    """
+    Producing tiles of every vertex, plus each vertex's own expected cards.
+    
+    Args:
+        board: Board object with tile information
+        
+    Returns:
+        Tuple of (per-vertex _vertex_production results, per-vertex expected
+        cards summed in tile order)
+    """
+    production = [_vertex_production(v, board) for v in board.vertices]
+    
+    # Expected cards of each vertex on its own, summed in tile order
+    single_expected = []
+    for tiles, _, _ in production:
+        expected = 0.0
+        for _, prob in tiles:
+            expected += prob
+        single_expected.append(expected)
+    
+    return production, single_expected
+
+
+def _prob_at_least_one_cache(board):
+    """
+    Build a memoized P(at least one resource) lookup by covered number tokens.
+    
+    P(at least one) only depends on the set of number tokens covered, so each
+    distinct set is evaluated once.
+    
+    Args:
+        board: Board object with dice probabilities
+        
+    Returns:
+        Function mapping a frozenset of number tokens -> probability
+    """
+    prob_cache: Dict[FrozenSet[int], float] = {}
+    dice_probabilities = board.dice_probabilities
+    
+    def prob_for_numbers(numbers: FrozenSet[int]) -> float:
+        prob = prob_cache.get(numbers)
+        if prob is None:
+            if not numbers:
+                prob = 0.0
+            else:
+                prob_no_resource = 0.0
+                for roll in range(2, 13):
+                    if roll not in numbers:
+                        prob_no_resource += dice_probabilities[roll]
+                prob = 1.0 - prob_no_resource
+            prob_cache[numbers] = prob
+        return prob
+    
+    return prob_for_numbers
+
+
+def compute_single_quality_table(board,
+                                 w_resources: float = 1/3,
+                                 w_expected_cards: float = 1/3,
+                                 w_prob_at_least_one: float = 1/3) -> List[float]:
+    """
+    Combined quality score of a single settlement at every vertex.
+    
+    Gives the same values as calling compute_quality([v], ...) for each
+    vertex, scored from the per-vertex production summaries.
+    
+    Args:
+        board: Board object
+        w_resources: Weight for resource score component
+        w_expected_cards: Weight for expected cards component
+        w_prob_at_least_one: Weight for probability at least one component
+        
+    Returns:
+        List of quality scores indexed by vertex_id
+    """
+    production, single_expected = _vertex_summaries(board)
+    prob_for_numbers = _prob_at_least_one_cache(board)
+    
+    single_quality = []
+    for (tiles, resources, numbers), exp_cards in zip(production, single_expected):
+        res_score = len(resources) * 2.0 + len(tiles) * 0.5
+        prob_one = prob_for_numbers(numbers)
+        single_quality.append(w_resources * res_score +
+                              w_expected_cards * exp_cards +
+                              w_prob_at_least_one * prob_one)
+    return single_quality
+
+
+def compute_pair_quality_table(board,
+                               w_resources: float = 1/3,
+                               w_expected_cards: float = 1/3,
+                               w_prob_at_least_one: float = 1/3) -> List[List[float]]:
+    """
+    Combined quality score for every ordered pair of vertices.
+    
+    Gives the same values as calling compute_quality([v1, v2], ...) for each
+    pair, but the producing tiles of each vertex are resolved once up front and
+    every pair is scored from those per-vertex summaries instead of walking the
+    board's tiles again.
+    
+    Args:
+        board: Board object
+        w_resources: Weight for resource score component
+        w_expected_cards: Weight for expected cards component
+        w_prob_at_least_one: Weight for probability at least one component
+        
+    Returns:
+        table[v1][v2] -> quality score, with -inf on the diagonal
+    """
+    num_vertices = len(board.vertices)
+    production, single_expected = _vertex_summaries(board)
+    prob_for_numbers = _prob_at_least_one_cache(board)
+    
+    def expected_with(v: int, tile_mask: int, other_tiles) -> float:
+        # v's own tiles first, then the other vertex's tiles v does not touch,
+        # in the same order compute_quality adds them up
+        expected = single_expected[v]
+        for tile_idx, prob in other_tiles:
+            if not (tile_mask >> tile_idx) & 1:
+                expected += prob * 1.0
+        return expected
+    
+    # The resource score and P(at least one) are symmetric in (v1, v2), so they
+    # are computed once per unordered pair. Expected cards is a float sum whose
+    # rounding depends on the order of the two vertices, so it is still
+    # evaluated for each ordered pair to keep the table identical to
+    # compute_quality.
+    tile_masks = board.VERTEX_TILE_MASK
+    table = [[-float('inf')] * num_vertices for _ in range(num_vertices)]
+    for v1 in range(num_vertices):
+        tiles1, resources1, numbers1 = production[v1]
+        tile_mask1 = tile_masks[v1]
+        row = table[v1]
+        for v2 in range(v1 + 1, num_vertices):
+            tiles2, resources2, numbers2 = production[v2]
+            
+            res_score = len(resources1 | resources2) * 2.0 + (len(tiles1) + len(tiles2)) * 0.5
+            prob_one = prob_for_numbers(numbers1 | numbers2)
+            
+            exp_cards = expected_with(v1, tile_mask1, tiles2)
+            row[v2] = (w_resources * res_score +
+                       w_expected_cards * exp_cards +
+                       w_prob_at_least_one * prob_one)
+            
+            exp_cards = expected_with(v2, tile_masks[v2], tiles1)
+            table[v2][v1] = (w_resources * res_score +
+                             w_expected_cards * exp_cards +
+                             w_prob_at_least_one * prob_one)
+    
+    return table
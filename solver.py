@@ -6,6 +6,7 @@ optimal settlement placements for all players.
 """
 
 import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, Tuple
 from state import State
 from board import Board
@@ -13,6 +14,12 @@ from board import Board
 # Epsilon for floating point comparisons to avoid rounding errors
 EPSILON = 1e-6
 
+# The deadline is polled once every (DEADLINE_CHECK_MASK + 1) recursive calls
+DEADLINE_CHECK_MASK = 1023
+
+# (first_pos, second_pos) of consecutive players, starting with the player to move
+Placements = Tuple[Tuple[int, int], ...]
+
 
 class Solver:
     """
@@ -22,7 +29,10 @@ class Solver:
     def __init__(self, board: Board, enable_pruning: bool = True,
                  enable_feasibility: bool = True,
                  enable_upper_bound: bool = True,
-                 enable_memo: bool = True):
+                 enable_memo: bool = True,
+                 alpha_cutoff: Optional[float] = None,
+                 best_root_move: Optional[Tuple[int, int]] = None,
+                 workers: int = 1):
         """
         Initialize solver with a board.
         
@@ -32,11 +42,31 @@ class Solver:
             enable_feasibility: Enable feasibility pruning
             enable_upper_bound: Enable upper bound pruning
             enable_memo: Enable memoization
+            alpha_cutoff: Optional quality player 1 is already known to reach on
+                          this board (e.g. proven by another solver). First
+                          settlements whose upper bound cannot tie it are skipped
+                          at the root; if the value is too high, solve() finds
+                          no solution instead of a worse one.
+            best_root_move: Optional player 1 placement expected to be optimal
+                            (e.g. another solver's answer); its first
+                            settlement is tried first at the root so bounds
+                            tighten early. The answer is unchanged when the
+                            hint is the placement solve() returns anyway;
+                            another hint may select a different placement of
+                            equal quality.
+            workers: Number of processes that search player 1's first
+                     settlements in parallel (1 = serial). Only used with
+                     more than 2 players and upper bound pruning disabled:
+                     a pruned search takes milliseconds, less than starting
+                     the processes, and workers could not share its bounds
+                     or memo.
         """
         self.board = board
         self.num_players = board.num_players  # Get num_players from board
-        self.memo = {}  # (player, state_key) -> (best_payoff, decisions)
-        # decisions: dict mapping player -> [vertex1, vertex2] for players >= current player
+        self.memo = {}  # (player, occupied_mask) -> (best_payoff, placements)
+        # placements: what dfs returned there, the decisions of players >= current player
+        # Keys only describe the occupied vertices, so entries are only valid for
+        # this solver's board and the memo must never be shared across boards.
         
         # Handle legacy enable_pruning parameter
         if not enable_pruning:
@@ -48,17 +78,24 @@ class Solver:
         self.enable_upper_bound = enable_upper_bound
         self.enable_memo = enable_memo
         self.enable_pruning = enable_feasibility or enable_upper_bound  # For backward compatibility
+        self.alpha_cutoff = alpha_cutoff
+        self.best_root_move = best_root_move
+        self.workers = workers
+        self._root_candidates = None  # Restricts player 1's first settlements (parallel workers)
+        self._worker_memo_size = 0  # Memo entries created by the workers of a parallel solve
         
         # Metrics
         self.recursive_calls = 0
         self.feasibility_prunings = 0
         self.upper_bound_prunings = 0
+        self.alpha_prunings = 0
         self.memo_hits = 0
         self.memo_misses = 0
         self.start_time = None
         self.end_time = None
+        self.deadline = None  # time.monotonic() value after which dfs gives up
     
-    def dfs(self, player: int, state: State) -> Optional[State]:
+    def dfs(self, player: int, state: State) -> Optional[Placements]:
         """
         Recursive DFS to find optimal settlement placements.
         
@@ -68,201 +105,310 @@ class Solver:
         
         Args:
             player: Current player ID (1-4)
-            state: Current game state
+            state: Current game state. Only its occupied_mask is read; it is
+                   updated in place for each branch and restored while
+                   backtracking, so it is unchanged when dfs returns (the
+                   house slots are not touched during the search).
             
         Returns:
-            Best resulting State after all players have placed optimally,
-            or None if no valid placement exists
+            Placements of players player..num_players after all players have
+            placed optimally: a tuple of (first_pos, second_pos) pairs, the first
+            one for `player`. None if no valid placement exists.
         """
         # Track recursive calls
         self.recursive_calls += 1
         
-        # Base case: all players have placed
+        # Cooperative time limit: poll the clock every few calls only
+        if (self.deadline is not None and (self.recursive_calls & DEADLINE_CHECK_MASK) == 0
+                and time.monotonic() > self.deadline):
+            raise TimeoutError("Solver exceeded its time limit")
+        
+        # Base case: all players have placed, nothing left to decide
         if player > self.num_players:
-            return state
+            return ()
         
         # Memoization (if enabled)
         memo_key = None
         if self.enable_memo:
             # Memoization key - only occupied vertices matter, not who owns them
-            # This allows memo hits when same vertices are occupied by different players
-            occupied_vertices = tuple(sorted([v for v, p in state.occupied.items() if p is not None]))
-            available_vertices = tuple(sorted(state.available_vertices))
-            memo_key = (player, occupied_vertices, available_vertices)
+            # This allows memo hits when same vertices are occupied by different players.
+            # The available vertices are exactly the unoccupied ones, so the
+            # occupied bitmask (set for each branch below) is a
+            # complete, collision-free key that costs nothing to build.
+            memo_key = (player, state.occupied_mask)
             
-            # Check memo
-            if memo_key in self.memo:
+            # Check memo: the stored placements are the answer (no recursion needed)
+            memoized = self.memo.get(memo_key)
+            if memoized is not None:
                 self.memo_hits += 1
-                memoized_payoff, memoized_decisions = self.memo[memo_key]
-                
-                # Reconstruct state from memoized decisions (no recursion needed)
-                # The decisions dict contains: {player: [first_vertex, second_vertex]}
-                # We need to apply them in the correct order: 3, 4, 4, 3 (for player 3)
-                reconstructed_state = state.clone()
-                
-                # Apply decisions in snake order: player, player+1, ..., num_players, num_players, ..., player
-                # First settlements: player, player+1, ..., num_players
-                for p in range(player, self.num_players + 1):
-                    if p in memoized_decisions:
-                        vertices = memoized_decisions[p]
-                        if len(vertices) >= 1:
-                            reconstructed_state.place_settlement(p, vertices[0])
-                
-                # Second settlements: num_players, num_players-1, ..., player (reverse order)
-                for p in range(self.num_players, player - 1, -1):
-                    if p in memoized_decisions:
-                        vertices = memoized_decisions[p]
-                        if len(vertices) >= 2:
-                            reconstructed_state.place_settlement(p, vertices[1])
-                
-                # Return reconstructed state (no recursion needed!)
-                return reconstructed_state
-            else:
-                self.memo_misses += 1
+                return memoized[1]
+            self.memo_misses += 1
         
         # Local lower bound for this player at this node
         best_value = -float('inf')
-        best_state_for_player = None
+        best_placements = None
         
-        # Get feasible positions for first settlement
-        first_candidates = state.get_feasible_positions(player)
+        # Get feasible positions for first settlement, already sorted by
+        # individual quality in descending order (see below)
+        neighbor_mask = self.board.NEIGHBOR_MASK
+        occupied_mask = state.occupied_mask
+        first_candidates = [v for v in self.board.vertices_by_quality
+                            if not (neighbor_mask[v] & occupied_mask)]
         
         # If no feasible positions, return None
         if not first_candidates:
             if self.enable_memo:
-                self.memo[memo_key] = (-float('inf'), {})
+                self.memo[memo_key] = (-float('inf'), None)
             return None
         
-        # Always sort candidates by individual quality in descending order
+        # Always visit candidates by individual quality in descending order
         # This helps improve LB faster, enabling more pruning
-        # We also cache the UB values if upper bound pruning is enabled
-        candidate_ubs = {}  # Cache for upper bounds
-        
-        # Sort by individual quality: best candidates first
-        # This is consistent across all modalities and helps establish strong LB early
-        candidates_with_quality = []
-        for pos in first_candidates:
-            if state.is_feasible(player, pos):
-                quality = state.board.single_quality.get(pos, 0.0)
-                candidates_with_quality.append((quality, pos))
-                
-                # If upper bound pruning is enabled, also compute and cache UB
-                if self.enable_upper_bound:
-                    ub = state.upper_bound_for_player_given_first(player, pos)
-                    candidate_ubs[pos] = ub
-        
-        # Sort by quality descending (best first)
-        candidates_with_quality.sort(reverse=True, key=lambda x: x[0])
-        first_candidates = [pos for _, pos in candidates_with_quality]
-        
-        # Try each feasible first position (now sorted by quality/UB)
-        for first_pos in first_candidates:
-            # 1. Feasibility pruning (already done, but double-check)
-            if not state.is_feasible(player, first_pos):
-                if self.enable_feasibility:
-                    self.feasibility_prunings += 1
-                continue
+        # The feasibility rule was applied above, so every candidate is
+        # feasible and its UB (if enabled) is computed exactly once.
+        # board.vertices_by_quality is sorted once per board with a stable sort,
+        # so equal-quality candidates stay in ascending vertex order. Vertex IDs
+        # are numbered tile by tile, so that order already visits neighbouring
+        # vertices together, and it also fixes which of several equally good
+        # placements is returned.
+        
+        if player == 1:
+            # A parallel worker only searches the root branches it was given
+            if self._root_candidates is not None:
+                first_candidates = [v for v in first_candidates if v in self._root_candidates]
             
-            # 2. Upper bound pruning (use cached value if available)
-            if self.enable_upper_bound:
-                UB = candidate_ubs.get(first_pos, 
-                                      state.upper_bound_for_player_given_first(player, first_pos))
+            # At the root, try the hinted first settlement before the others. The
+            # hint is the first best choice in the order above, so every candidate
+            # sorted before it is strictly worse and the strict '>' below still
+            # returns the same placement.
+            if self.best_root_move is not None:
+                hinted_pos = self.best_root_move[0]
+                if hinted_pos in first_candidates:
+                    first_candidates.remove(hinted_pos)
+                    first_candidates.insert(0, hinted_pos)
+        
+        # The alpha cutoff is a value of player 1, so it only applies at the
+        # root (the single node where player 1 moves). Values of later players
+        # say nothing about it in this general-sum game.
+        alpha_cutoff = self.alpha_cutoff if player == 1 else None
+        
+        # Cache the UB values if upper bound pruning or the alpha cutoff needs them
+        candidate_ubs = {}
+        if self.enable_upper_bound or alpha_cutoff is not None:
+            candidate_ubs = dict(zip(first_candidates,
+                                     state.upper_bounds_for_player(player, first_candidates)))
+        
+        # Hot-loop references as locals
+        enable_upper_bound = self.enable_upper_bound
+        pair_table = self.board.pair_quality_table
+        pair_order = self.board.pair_quality_order
+        dfs = self.dfs
+        
+        # Try each feasible first position (now sorted by quality)
+        for first_pos in first_candidates:
+            # 1. Upper bound pruning (feasibility was enforced when generating candidates)
+            if enable_upper_bound:
+                UB = candidate_ubs[first_pos]
                 # Use epsilon to avoid rounding errors: only prune if UB + epsilon still can't beat best_value
                 if UB + EPSILON <= best_value:
                     # This branch cannot beat the best known value for this player
                     self.upper_bound_prunings += 1
                     continue
-            
-            # 3. Place first settlement
-            s1 = state.clone()
-            s1.place_settlement(player, first_pos)
-            
-            # 4. Recurse on later players
-            s2 = self.dfs(player + 1, s1)
-            if s2 is None:
+            if alpha_cutoff is not None and candidate_ubs[first_pos] + EPSILON < alpha_cutoff:
+                # This branch cannot even tie the value known to be reachable
+                self.alpha_prunings += 1
                 continue
             
-            # 5. Now place the second settlement for this player (best complement)
-            second_candidates = s2.get_feasible_positions(player)
-            second_candidates = [v for v in second_candidates if v != first_pos]
+            # 2. Occupy the first settlement in place (restored right after the
+            # recursion). The search below only reads the occupied mask, so
+            # that is all that changes; the candidate is feasible by
+            # construction, so place_settlement's checks are not needed.
+            branch_mask = occupied_mask | (1 << first_pos)
+            state.occupied_mask = branch_mask
             
-            if not second_candidates:
+            # 3. Recurse on later players, then collect every vertex occupied
+            # once they have all placed (this player's first settlement included)
+            later_placements = dfs(player + 1, state)
+            state.occupied_mask = occupied_mask
+            if later_placements is None:
                 continue
+            for later_first, later_second in later_placements:
+                branch_mask |= (1 << later_first) | (1 << later_second)
             
-            # Pick best second position using precomputed pair_quality
-            best_second_pos = None
-            best_two_house_value = -float('inf')
-            
-            for second_pos in second_candidates:
-                val = s2.pair_quality(player, first_pos, second_pos)
-                if val > best_two_house_value:
-                    best_two_house_value = val
-                    best_second_pos = second_pos
-            
-            if best_second_pos is None:
-                continue
+            # 4. Now place the second settlement for this player (best complement).
+            # first_pos is occupied, so it is never a candidate itself.
+            # The first feasible vertex in the first settlement's row order is
+            # the best one (the lowest vertex of equally good positions), so
+            # the scan stops there instead of ranking every feasible vertex.
+            for best_second_pos in pair_order[first_pos]:
+                if not (neighbor_mask[best_second_pos] & branch_mask):
+                    break
+            else:
+                continue  # No feasible second position
             
-            s_final = s2.clone()
-            s_final.place_settlement(player, best_second_pos)
+            best_two_house_value = pair_table[first_pos][best_second_pos]
             
-            # 6. This branch payoff for this player (their own two-settlement benefit)
+            # 5. This branch payoff for this player (their own two-settlement benefit)
             branch_value = best_two_house_value
             
             # Update local LB
             if branch_value > best_value:
                 best_value = branch_value
-                best_state_for_player = s_final
+                best_placements = ((first_pos, best_second_pos),) + later_placements
         
-        # Store in memo with decisions (if memo enabled)
+        # Store in memo with the decisions of players >= current player (if memo enabled)
         if self.enable_memo:
-            # Extract decisions for players >= current player from best_state_for_player
-            decisions = {}
-            if best_state_for_player is not None:
-                for p in range(player, self.num_players + 1):
-                    if p in best_state_for_player.houses and len(best_state_for_player.houses[p]) == 2:
-                        decisions[p] = best_state_for_player.houses[p].copy()
-            
-            self.memo[memo_key] = (best_value, decisions)
+            self.memo[memo_key] = (best_value, best_placements)
         
-        return best_state_for_player
+        return best_placements
     
-    def solve(self) -> Tuple[Optional[State], Optional[Tuple[int, int]], Optional[float]]:
+    def reset(self, board: Board):
+        """
+        Point this solver at another board, keeping its pruning configuration.
+        
+        The memo is dropped, since its entries are only valid for the previous
+        board; solve() resets the metrics itself.
+        
+        Args:
+            board: Board object to solve next
+        """
+        self.board = board
+        self.num_players = board.num_players
+        self.memo.clear()
+        self.alpha_cutoff = None  # Only valid for the previous board
+        self.best_root_move = None
+        self.start_time = None
+        self.end_time = None
+        self.deadline = None
+    
+    def solve(self, time_limit: Optional[float] = None) -> Tuple[Optional[State], Optional[Tuple[int, int]], Optional[float]]:
         """
         Solve for optimal settlement placements.
         
+        Args:
+            time_limit: Optional time budget in seconds. The search checks it
+                       cooperatively and raises TimeoutError once it is exceeded.
+        
         Returns:
             Tuple of (final_state, player1_positions, player1_quality)
             where player1_positions is (first_pos, second_pos)
         """
-        # Reset metrics
-        self.recursive_calls = 0
-        self.feasibility_prunings = 0
-        self.upper_bound_prunings = 0
-        self.memo_hits = 0
-        self.memo_misses = 0
+        self._reset_metrics()
         self.memo.clear()
         
         # Start timer
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
+        self.deadline = time.monotonic() + time_limit if time_limit is not None else None
         
         initial_state = State(self.board, num_players=self.num_players)
-        final_state = self.dfs(player=1, state=initial_state)
+        if self.workers > 1 and self.num_players > 2 and not self.enable_upper_bound:
+            placements = self._solve_root_parallel(initial_state, time_limit)
+        else:
+            placements = self.dfs(player=1, state=initial_state)
         
         # End timer
-        self.end_time = time.time()
+        self.end_time = time.perf_counter()
         
-        if final_state is None:
+        if placements is None:
             return None, None, None
         
+        # Replay the placements once, in snake order, for the caller
+        final_state = State(self.board, num_players=self.num_players)
+        for p in range(1, self.num_players + 1):
+            final_state.place_settlement(p, placements[p - 1][0])
+        for p in range(self.num_players, 0, -1):
+            final_state.place_settlement(p, placements[p - 1][1])
+        
         # Get Player 1's positions and quality
-        if len(final_state.houses[1]) != 2:
+        if final_state.house_counts[1] != 2:
             return final_state, None, None
         
-        first_pos, second_pos = final_state.houses[1]
+        first_pos, second_pos = final_state.player_houses(1)
         p1_quality = final_state.quality_of_player(1)
         
         return final_state, (first_pos, second_pos), p1_quality
     
+    def _reset_metrics(self):
+        """Reset the search counters before a new search."""
+        self.recursive_calls = 0
+        self.feasibility_prunings = 0
+        self.upper_bound_prunings = 0
+        self.alpha_prunings = 0
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self._worker_memo_size = 0
+    
+    def _solve_root_parallel(self, state: State, time_limit: Optional[float]) -> Optional[Placements]:
+        """
+        Search player 1's first settlements in parallel worker processes.
+        
+        Each root branch is an independent subtree; the workers search them
+        with their own solvers and memos, and the branch values are reduced
+        here in candidate order (the hinted first settlement of
+        best_root_move first, as in dfs), so the result is the placement the
+        serial dfs returns. Only used without upper bound pruning, so no
+        branch can prune another. With memoization the workers repeat work
+        a shared memo would save. cancel() does not reach the workers; they
+        stop at the time limit.
+        
+        Args:
+            state: Empty initial state
+            time_limit: Optional time budget in seconds
+            
+        Returns:
+            Best placements of all players, as returned by dfs, or None if no
+            valid placement exists
+        """
+        # Same candidates and order as the root of dfs
+        first_candidates = [v for v in self.board.vertices_by_quality
+                            if not (self.board.NEIGHBOR_MASK[v] & state.occupied_mask)]
+        if self.best_root_move is not None and self.best_root_move[0] in first_candidates:
+            first_candidates.remove(self.best_root_move[0])
+            first_candidates.insert(0, self.best_root_move[0])
+        
+        workers = min(self.workers, len(first_candidates))
+        if workers < 2:
+            # Nothing to spread over several processes
+            return self.dfs(player=1, state=state)
+        
+        self.recursive_calls += 1  # The root node itself
+        best_value = -float('inf')
+        best_placements = None
+        deadline = time.time() + time_limit if time_limit is not None else None
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_root_worker,
+                                 initargs=(self.board, self.enable_feasibility,
+                                           self.enable_upper_bound, self.enable_memo)) as executor:
+            futures = [executor.submit(_solve_root_branch, (first_pos, deadline, self.alpha_cutoff))
+                       for first_pos in first_candidates]
+            try:
+                # Reduce in candidate order: the strict '>' keeps the first of
+                # equally good branches, as in dfs
+                for future in futures:
+                    branch_value, placements, metrics = future.result()
+                    self.recursive_calls += metrics['recursive_calls'] - 1  # Worker roots are this root
+                    self.upper_bound_prunings += metrics['upper_bound_prunings']
+                    self.alpha_prunings += metrics['alpha_prunings']
+                    self.memo_hits += metrics['memo_hits']
+                    self.memo_misses += metrics['memo_misses']
+                    self._worker_memo_size += metrics['memo_size']
+                    if placements is not None and branch_value > best_value:
+                        best_value = branch_value
+                        best_placements = placements
+            finally:
+                for future in futures:
+                    future.cancel()
+        
+        return best_placements
+    
+    def cancel(self):
+        """
+        Ask a running solve() to stop.
+        
+        The search notices at its next deadline check and raises TimeoutError,
+        exactly as if its time limit had expired. Safe to call from another
+        thread, e.g. from a threading.Timer or a GUI callback.
+        """
+        self.deadline = -float('inf')
+    
     def get_metrics(self) -> dict:
         """
         Get performance metrics.
@@ -270,16 +416,17 @@ class Solver:
         Returns:
             Dictionary with metrics
         """
-        elapsed_time = (self.end_time - self.start_time) if self.end_time and self.start_time else 0.0
+        elapsed_time = (self.end_time - self.start_time) if self.end_time is not None and self.start_time is not None else 0.0
         
         return {
             'recursive_calls': self.recursive_calls,
             'feasibility_prunings': self.feasibility_prunings,
             'upper_bound_prunings': self.upper_bound_prunings,
+            'alpha_prunings': self.alpha_prunings,
             'total_prunings': self.feasibility_prunings + self.upper_bound_prunings,
             'memo_hits': self.memo_hits,
             'memo_misses': self.memo_misses,
-            'memo_size': len(self.memo),
+            'memo_size': len(self.memo) + self._worker_memo_size,
             'memo_hit_rate': self.memo_hits / (self.memo_hits + self.memo_misses) if (self.memo_hits + self.memo_misses) > 0 else 0.0,
             'elapsed_time_seconds': elapsed_time,
             'pruning_enabled': self.enable_pruning
@@ -305,3 +452,57 @@ class Solver:
         print(f"  Memo size: {metrics['memo_size']:,}")
         print()
 
+
+# Solver of a parallel root worker process, set up by _init_root_worker
+_root_solver = None
+
+
+def _init_root_worker(board, enable_feasibility, enable_upper_bound, enable_memo):
+    """
+    Set up a worker process of Solver._solve_root_parallel.
+    
+    The board is pickled once per worker here instead of once per branch, and
+    the worker's solver keeps its memo across the branches it searches (all
+    on the same board).
+    """
+    global _root_solver
+    _root_solver = Solver(board, enable_pruning=True,
+                          enable_feasibility=enable_feasibility,
+                          enable_upper_bound=enable_upper_bound,
+                          enable_memo=enable_memo)
+
+
+def _solve_root_branch(task):
+    """
+    Search one of player 1's first settlements in a worker process.
+    
+    Args:
+        task: Tuple of (first_pos, deadline, alpha_cutoff); deadline is a
+              time.time() value or None
+        
+    Returns:
+        Tuple of (branch_value, placements, metrics), where placements are
+        the branch's placements as returned by dfs, or None if the branch has
+        no valid placement
+    """
+    first_pos, deadline, alpha_cutoff = task
+    solver = _root_solver
+    solver._reset_metrics()
+    solver._root_candidates = (first_pos,)
+    solver.alpha_cutoff = alpha_cutoff
+    # time.time() rather than monotonic(), whose values are only comparable
+    # within one process
+    solver.deadline = time.monotonic() + (deadline - time.time()) if deadline is not None else None
+    
+    memo_size = len(solver.memo)
+    placements = solver.dfs(player=1, state=State(solver.board, num_players=solver.num_players))
+    # The root entry only covers this branch; entries below it stay valid
+    # for the worker's next branches
+    solver.memo.pop((1, 0), None)
+    metrics = solver.get_metrics()
+    metrics['memo_size'] = len(solver.memo) - memo_size
+    
+    if placements is None:
+        return None, None, metrics
+    first_pos, second_pos = placements[0]
+    return solver.board.pair_quality_table[first_pos][second_pos], placements, metrics
@@ -6,7 +6,6 @@ settlement placements, feasibility checking, and memoization keys.
 """
 
 from typing import Dict, List, Set, Optional, Hashable
-from copy import deepcopy
 
 
 class State:
@@ -17,6 +16,9 @@ class State:
     and provides methods for checking feasibility and computing quality.
     """
     
+    # Fixed attribute set: the solver reads occupied_mask at every node
+    __slots__ = ('board', 'num_players', 'house_slots', 'house_counts', 'occupied_mask')
+    
     def __init__(self, board, num_players: int = 4):
         """
         Initialize an empty state.
@@ -27,17 +29,14 @@ class State:
         """
         self.board = board
         self.num_players = num_players
-        self.houses: Dict[int, List[int]] = {}  # houses[player] = list of vertices
-        self.occupied: Dict[int, Optional[int]] = {}  # occupied[vertex] = player or None
-        self.available_vertices: Set[int] = set(board.vertices)
-        
-        # Initialize for all players
-        for player in range(1, num_players + 1):
-            self.houses[player] = []
-        
-        # Initialize occupied dict
-        for vertex in board.vertices:
-            self.occupied[vertex] = None
+        # Settlements of player p live in house_slots[2p] and house_slots[2p + 1]
+        # (slots 0-1 are unused, -1 marks an empty slot); house_counts[p] is how
+        # many of them are filled
+        self.house_slots: List[int] = [-1] * (2 * (num_players + 1))
+        self.house_counts: List[int] = [0] * (num_players + 1)
+        # Occupancy is a single int (bit v set iff vertex v is occupied); the
+        # occupied and available_vertices views are derived from it on demand
+        self.occupied_mask = 0
     
     def clone(self) -> "State":
         """
@@ -46,31 +45,89 @@ class State:
         Returns:
             New State object with copied data
         """
-        new_state = State(self.board, num_players=self.num_players)
-        new_state.houses = deepcopy(self.houses)
-        new_state.occupied = deepcopy(self.occupied)
-        new_state.available_vertices = self.available_vertices.copy()
+        # Skip __init__: every field is overwritten with a copy below
+        new_state = State.__new__(State)
+        new_state.board = self.board
+        new_state.num_players = self.num_players
+        new_state.house_slots = self.house_slots.copy()
+        new_state.house_counts = self.house_counts.copy()
+        new_state.occupied_mask = self.occupied_mask
         return new_state
     
     def place_settlement(self, player: int, vertex: int) -> None:
         """
         Place a settlement for the given player at the given vertex.
         
-        Updates houses, occupied, and available_vertices.
+        Updates the house slots and the occupied mask.
         
         Args:
             player: Player ID (1-4)
             vertex: Vertex ID where settlement is placed
         """
-        if vertex not in self.available_vertices:
+        if (self.occupied_mask >> vertex) & 1:
             raise ValueError(f"Vertex {vertex} is not available")
         
         if not self.is_feasible(player, vertex):
             raise ValueError(f"Placing settlement at vertex {vertex} is not feasible")
         
-        self.houses[player].append(vertex)
-        self.occupied[vertex] = player
-        self.available_vertices.remove(vertex)
+        count = self.house_counts[player]
+        if count == 2:
+            raise ValueError(f"Player {player} already has 2 settlements")
+        
+        self.house_slots[2 * player + count] = vertex
+        self.house_counts[player] = count + 1
+        self.occupied_mask |= 1 << vertex
+    
+    def player_houses(self, player: int) -> List[int]:
+        """
+        Get the vertices of a player's settlements, in placement order.
+        
+        Args:
+            player: Player ID (1-4)
+            
+        Returns:
+            List of 0-2 vertex IDs
+        """
+        start = 2 * player
+        return self.house_slots[start:start + self.house_counts[player]]
+    
+    @property
+    def houses(self) -> Dict[int, List[int]]:
+        """
+        Settlements of every player, for display code.
+        
+        Built on each access from house_slots; modifying it does not change
+        the state.
+        
+        Returns:
+            Dictionary mapping player -> list of vertex IDs in placement order
+        """
+        return {player: self.player_houses(player) for player in range(1, self.num_players + 1)}
+    
+    @property
+    def occupied(self) -> Dict[int, Optional[int]]:
+        """
+        Owner of every vertex, built on each access from the house slots.
+        
+        Returns:
+            Dictionary mapping vertex -> player, or None if unoccupied
+        """
+        occupied: Dict[int, Optional[int]] = dict.fromkeys(self.board.vertices)
+        for slot, vertex in enumerate(self.house_slots):
+            if vertex != -1:
+                occupied[vertex] = slot // 2
+        return occupied
+    
+    @property
+    def available_vertices(self) -> Set[int]:
+        """
+        Unoccupied vertices, built on each access from the occupied mask.
+        
+        Returns:
+            Set of vertex IDs
+        """
+        occupied_mask = self.occupied_mask
+        return {v for v in self.board.vertices if not (occupied_mask >> v) & 1}
     
     def is_feasible(self, player: int, vertex: int) -> bool:
         """
@@ -87,21 +144,9 @@ class State:
         Returns:
             True if placement is feasible, False otherwise
         """
-        # Check if vertex is available
-        if vertex not in self.available_vertices:
-            return False
-        
-        # Check if vertex is already occupied
-        if self.occupied[vertex] is not None:
-            return False
-        
-        # Check distance rule: vertex must not be adjacent to any occupied vertex
-        neighbors = self.board.vertex_neighbors.get(vertex, set())
-        for neighbor in neighbors:
-            if self.occupied[neighbor] is not None:
-                return False
-        
-        return True
+        # The neighbor mask includes the vertex itself, so a single AND against
+        # the occupied mask checks occupancy and the distance rule together
+        return not (self.board.NEIGHBOR_MASK[vertex] & self.occupied_mask)
     
     def get_feasible_positions(self, player: int) -> List[int]:
         """
@@ -113,11 +158,13 @@ class State:
         Returns:
             List of feasible vertex IDs
         """
-        feasible = []
-        for vertex in self.available_vertices:
-            if self.is_feasible(player, vertex):
-                feasible.append(vertex)
-        return feasible
+        # Inline the is_feasible mask test: this runs for every DFS node and
+        # every upper bound, so avoid a method call per vertex. Vertices are
+        # scanned in ascending order (the neighbor mask covers occupancy), so
+        # the result does not depend on set iteration order.
+        neighbor_mask = self.board.NEIGHBOR_MASK
+        occupied_mask = self.occupied_mask
+        return [v for v in self.board.vertices if not (neighbor_mask[v] & occupied_mask)]
     
     def pair_quality(self, player: int, v1: int, v2: int) -> float:
         """
@@ -131,7 +178,7 @@ class State:
         Returns:
             Quality score
         """
-        return self.board.pair_quality[player][v1][v2]
+        return self.board.pair_quality_table[v1][v2]
     
     def quality_of_player(self, player: int) -> float:
         """
@@ -145,11 +192,10 @@ class State:
         Returns:
             Quality score for player's two settlements
         """
-        houses = self.houses[player]
-        if len(houses) != 2:
+        if self.house_counts[player] != 2:
             raise ValueError(f"Player {player} does not have exactly 2 settlements")
         
-        v1, v2 = houses[0], houses[1]
+        v1, v2 = self.house_slots[2 * player], self.house_slots[2 * player + 1]
         return self.pair_quality(player, v1, v2)
     
     def make_key(self) -> Hashable:
@@ -161,8 +207,8 @@ class State:
         """
         # Create sorted list of (player, vertex) pairs
         placements = []
-        for p in sorted(self.houses.keys()):
-            for v in sorted(self.houses[p]):
+        for p in range(1, self.num_players + 1):
+            for v in sorted(self.player_houses(p)):
                 placements.append((p, v))
         
         # Create sorted tuple of available vertices
@@ -185,19 +231,40 @@ class State:
         Returns:
             Upper bound on quality score
         """
-        # Get feasible positions for second settlement
-        candidates = self.get_feasible_positions(player)
-        candidates = [v for v in candidates if v != first_pos]
-        
-        if not candidates:
-            return -float('inf')
+        # Maximum over the first settlement's row of the pair quality table,
+        # restricted to the currently feasible second positions. The diagonal
+        # entry is -inf, so first_pos itself never wins.
+        neighbor_mask = self.board.NEIGHBOR_MASK
+        occupied_mask = self.occupied_mask
+        row = self.board.pair_quality_table[first_pos]
+        return max((row[v] for v in self.board.vertices if not (neighbor_mask[v] & occupied_mask)),
+                   default=-float('inf'))
+    
+    def upper_bounds_for_player(self, player: int, first_positions: List[int]) -> List[float]:
+        """
+        Compute upper_bound_for_player_given_first for several first positions.
         
-        # Find maximum pair quality over all feasible second positions
-        max_quality = -float('inf')
-        for second_pos in candidates:
-            quality = self.pair_quality(player, first_pos, second_pos)
-            if quality > max_quality:
-                max_quality = quality
+        Each bound is the pair quality of the first feasible vertex in the first
+        position's board.pair_quality_order row, which is the maximum over the
+        feasible second positions without scanning all of them.
         
-        return max_quality
-
+        Args:
+            player: Player ID (1-4)
+            first_positions: Vertex IDs for the first settlement
+            
+        Returns:
+            List of upper bounds, in the order of first_positions
+        """
+        neighbor_mask = self.board.NEIGHBOR_MASK
+        occupied_mask = self.occupied_mask
+        table = self.board.pair_quality_table
+        order = self.board.pair_quality_order
+        bounds = []
+        for first_pos in first_positions:
+            for v in order[first_pos]:
+                if not (neighbor_mask[v] & occupied_mask):
+                    bounds.append(table[first_pos][v])
+                    break
+            else:
+                bounds.append(-float('inf'))
+        return bounds
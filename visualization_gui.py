@@ -5,11 +5,16 @@ Uses matplotlib to create a graphical representation.
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.patches import RegularPolygon, Circle
+from matplotlib.collections import PolyCollection, EllipseCollection
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import math
 import numpy as np
+from functools import lru_cache
 from typing import Optional, Dict
 from state import State
-from board import Board
+from board import Board, DESERT_ID
 
 # Hardcoded template positions for Catan board visualization.
 # Consistent with Board.VERTEX_TO_TILES and Board.VERTEX_NEIGHBORS.
@@ -37,6 +42,10 @@ TILE_CENTERS = {
     18: (4.156922, 4.800000),
 }
 
+# Bounding box of the tile centers, ((min_x, min_y), (max_x, max_y))
+TILE_CENTERS_BOUNDS = (np.min(list(TILE_CENTERS.values()), axis=0),
+                       np.max(list(TILE_CENTERS.values()), axis=0))
+
 # Vertex positions (vertex_id: (x, y))
 VERTEX_POSITIONS = {
     0:  (2.078461, -0.400000),
@@ -99,7 +108,46 @@ VERTEX_POSITIONS = {
 HEX_RADIUS = 0.8
 HEX_ORIENTATION = 0.0  # 0 degrees - pointy top (puntas hacia arriba)
 
+# Subplot margins of the 14x12 in board figure: room for the two-line title
+# (centered over the axes) and for the legend to the right of the axes
+BOARD_FIGURE_MARGINS = dict(left=0.05, right=0.85, top=0.945, bottom=0.015)
+
+# Row offsets (in hexagon widths) to center the irregular 3-4-5-4-3 layout:
+# rows 0 and 4 offset right, rows 1 and 3 slightly, row 2 centered
+HEX_ROW_OFFSETS = (1.0, 0.5, 0.0, 0.5, 1.0)
+SQRT3 = math.sqrt(3)
+
+# Corner offsets of a pointy-top hexagon of radius HEX_RADIUS (same corners
+# as RegularPolygon with orientation=HEX_ORIENTATION), shape (6, 2)
+HEX_CORNER_OFFSETS = HEX_RADIUS * np.array(
+    [(np.cos(angle), np.sin(angle)) for angle in HEX_ORIENTATION + np.pi / 2 + np.pi / 3 * np.arange(6)])
+
+# Resource colors and abbreviations
+RESOURCE_COLORS = {
+    'wood': '#8B4513',      # Brown
+    'brick': '#CD5C5C',      # Reddish
+    'wheat': '#FFD700',      # Gold
+    'ore': '#708090',        # Gray
+    'sheep': '#90EE90',      # Light green
+    'desert': '#F5DEB3'      # Beige
+}
+RESOURCE_ABBREV = {
+    'wood': 'W',
+    'brick': 'B',
+    'wheat': 'G',
+    'ore': 'O',
+    'sheep': 'S',
+    'desert': 'D'
+}
+
+# RGBA color and abbreviation of every resource, indexed by resource ID
+# (Board.RESOURCE_NAMES order), so tile colors are a single array lookup on
+# board.tile_resource_ids instead of per-tile dictionary and hex parsing
+RESOURCE_RGBA = np.array([to_rgba(RESOURCE_COLORS[name]) for name in Board.RESOURCE_NAMES])
+RESOURCE_ABBREV_BY_ID = tuple(RESOURCE_ABBREV[name] for name in Board.RESOURCE_NAMES)
+
 
+@lru_cache(maxsize=None)
 def hex_to_pixel(row: int, col: int, size: float = 1.0) -> tuple:
     """
     Convert hexagonal grid coordinates to pixel coordinates for Catan layout.
@@ -111,6 +159,8 @@ def hex_to_pixel(row: int, col: int, size: float = 1.0) -> tuple:
     - Row 3: 4 tiles (cols 0, 1, 2, 3) - tiles 12, 13, 14, 15
     - Row 4: 3 tiles (cols 0, 1, 2) - tiles 16, 17, 18
     
+    The layout is fixed, so results are cached per (row, col, size).
+    
     Args:
         row: Row in hexagonal grid (0-4)
         col: Column in hexagonal grid
@@ -119,20 +169,11 @@ def hex_to_pixel(row: int, col: int, size: float = 1.0) -> tuple:
     Returns:
         (x, y) pixel coordinates
     """
-    # Row offsets to center the irregular layout
-    row_offsets = {
-        0: 1.0,   # Row 0 (3 tiles) - offset right
-        1: 0.5,   # Row 1 (4 tiles) - slight offset
-        2: 0.0,   # Row 2 (5 tiles) - centered
-        3: 0.5,   # Row 3 (4 tiles) - slight offset
-        4: 1.0    # Row 4 (3 tiles) - offset right
-    }
-    
     # Base offset for this row
-    offset = row_offsets.get(row, 0.0)
+    offset = HEX_ROW_OFFSETS[row] if 0 <= row < len(HEX_ROW_OFFSETS) else 0.0
     
     # Calculate position with offset
-    x = size * (np.sqrt(3) * (col + offset))
+    x = size * (SQRT3 * (col + offset))
     y = size * (3/2 * row)
     return (x, y)
 
@@ -151,7 +192,7 @@ def vertex_to_pixel(vertex_id: int, tile_centers: Dict[int, tuple],
     Returns:
         (x, y) pixel coordinates for the vertex
     """
-    tile_ids = board.tiles_touching.get(vertex_id, [])
+    tile_ids = board.tiles_touching[vertex_id]
     if not tile_ids:
         return (0, 0)
     
@@ -164,12 +205,12 @@ def vertex_to_pixel(vertex_id: int, tile_centers: Dict[int, tuple],
         # Vertex touches one tile - it's on the outer edge
         # Use neighbors to determine the correct direction
         tile_x, tile_y = positions[0]
-        neighbors = board.vertex_neighbors.get(vertex_id, [])
+        neighbors = board.vertex_neighbors[vertex_id]
         
         if neighbors:
             # Find a neighbor that also touches this tile (or touches 2 tiles)
             for nv in neighbors:
-                nv_tiles = board.tiles_touching.get(nv, [])
+                nv_tiles = board.tiles_touching[nv]
                 if len(nv_tiles) >= 2:
                     # Calculate neighbor's position (it touches 2+ tiles)
                     nv_positions = [tile_centers[tid] for tid in nv_tiles if tid in tile_centers]
@@ -215,29 +256,69 @@ def vertex_to_pixel(vertex_id: int, tile_centers: Dict[int, tuple],
         return (avg_x, avg_y)
 
 
+def _artist_counts(ax) -> tuple:
+    """
+    Number of collections, patches and texts currently on an axes.
+    
+    Args:
+        ax: Matplotlib axes
+        
+    Returns:
+        Tuple of counts, to pass to _artists_since
+    """
+    return (len(ax.collections), len(ax.patches), len(ax.texts))
+
+
+def _artists_since(ax, counts: tuple) -> list:
+    """
+    Collections, patches and texts added to an axes after _artist_counts.
+    
+    Args:
+        ax: Matplotlib axes
+        counts: Value returned by _artist_counts
+        
+    Returns:
+        List of artists
+    """
+    n_collections, n_patches, n_texts = counts
+    return list(ax.collections[n_collections:]) + list(ax.patches[n_patches:]) + list(ax.texts[n_texts:])
+
+
 def visualize_board_gui(board: Board, state: Optional[State] = None, 
-                        save_path: Optional[str] = None):
+                        save_path: Optional[str] = None, ax=None):
     """
     Create a graphical visualization of the Catan board.
     
+    Passing the same ax on repeated calls reuses its figure instead of
+    creating a new one: the settlements drawn by the previous call are
+    removed, and the tiles are only redrawn if the board changed.
+    
     Args:
         board: Board object
         state: Optional State object to show player settlements
         save_path: Optional path to save the figure
+        ax: Optional matplotlib axes to draw on; if given, the figure is
+            saved when save_path is set but never shown
     """
-    fig, ax = plt.subplots(1, 1, figsize=(14, 12))
+    owns_figure = ax is None
+    if owns_figure:
+        fig, ax = plt.subplots(1, 1, figsize=(14, 12))
+    else:
+        fig = ax.figure
     ax.set_aspect('equal')
     ax.axis('off')
     
-    # Resource colors
-    resource_colors = {
-        'wood': '#8B4513',      # Brown
-        'brick': '#CD5C5C',      # Reddish
-        'wheat': '#FFD700',      # Gold
-        'ore': '#708090',        # Gray
-        'sheep': '#90EE90',      # Light green
-        'desert': '#F5DEB3'      # Beige
-    }
+    # Artists left by a previous call on this axes: settlements are always
+    # redrawn, tiles only for a different board
+    cache = getattr(ax, '_catan_cache', None)
+    board_key = board.fingerprint()
+    if cache is not None:
+        for artist in cache['settlements']:
+            artist.remove()
+        if cache['board'] != board_key:
+            for artist in cache['tiles']:
+                artist.remove()
+            cache = None
     
     # Player colors
     player_colors = {
@@ -247,75 +328,87 @@ def visualize_board_gui(board: Board, state: Optional[State] = None,
         4: '#FFFF00',  # Yellow
     }
     
-    # Resource abbreviations
-    resource_abbrev = {
-        'wood': 'W',
-        'brick': 'B',
-        'wheat': 'G',
-        'ore': 'O',
-        'sheep': 'S',
-        'desert': 'D'
-    }
-    
-    # Draw tiles using template positions
-    for tile in board.tiles:
-        tile_id = tile['id']
-        if tile_id not in TILE_CENTERS:
-            continue
+    if cache is None:
+        tile_counts = _artist_counts(ax)
+        # Draw tiles using template positions, reading the board's per-tile lists
+        # directly instead of building board.tiles dictionaries. Hexagons and
+        # number token circles are each drawn as one collection rather than one
+        # patch per tile.
+        tile_ids = [tile_id for tile_id in range(len(board.tile_resource_ids)) if tile_id in TILE_CENTERS]
+        tile_resource_ids = board.tile_resource_ids
+        centers = np.array([TILE_CENTERS[tile_id] for tile_id in tile_ids])
         
-        x, y = TILE_CENTERS[tile_id]
-        resource = tile['resource']
-        color = resource_colors.get(resource, '#CCCCCC')
+        # Hexagons with pointy top (orientation=0)
+        hexagons = PolyCollection(centers[:, None, :] + HEX_CORNER_OFFSETS[None, :, :],
+                                  facecolors=RESOURCE_RGBA[[tile_resource_ids[tile_id] for tile_id in tile_ids]],
+                                  edgecolors='black', linewidths=2, alpha=0.9)
+        ax.add_collection(hexagons)
         
-        # Draw hexagon with pointy top (orientation=0)
-        hexagon = RegularPolygon((x, y), numVertices=6, radius=HEX_RADIUS,
-                                orientation=0.0, facecolor=color,
-                                edgecolor='black', linewidth=2, alpha=0.9)
-        ax.add_patch(hexagon)
+        # Circles for the number tokens (the desert has none)
+        token_ids = [tile_id for tile_id in tile_ids if board.tile_numbers[tile_id] is not None]
+        circle_radius = HEX_RADIUS * 0.25
+        token_centers = np.array([TILE_CENTERS[tile_id] for tile_id in token_ids]) - (0.0, HEX_RADIUS * 0.4)
+        token_circles = EllipseCollection(2 * circle_radius, 2 * circle_radius, 0.0, units='xy',
+                                          offsets=token_centers, offset_transform=ax.transData,
+                                          facecolors='white', edgecolors='black', linewidths=1.5)
+        ax.add_collection(token_circles)
         
-        # Add resource label
-        abbrev = resource_abbrev.get(resource, '?')
-        label_y = y + HEX_RADIUS * 0.4
-        ax.text(x, label_y, abbrev, ha='center', va='center',
-               fontsize=11, fontweight='bold', 
-               color='white' if resource != 'desert' else 'black',
-               bbox=dict(boxstyle='round,pad=0.3', facecolor='black', alpha=0.3) if resource == 'desert' else None)
-        
-        # Add number token
-        number = tile['number']
-        if number is not None:
-            # Draw circle for number
-            circle_radius = HEX_RADIUS * 0.25
-            circle = Circle((x, y - HEX_RADIUS * 0.4), circle_radius, 
-                           facecolor='white', edgecolor='black', linewidth=1.5)
-            ax.add_patch(circle)
-            ax.text(x, y - HEX_RADIUS * 0.4, str(number), ha='center', va='center',
-                   fontsize=9, fontweight='bold')
+        for tile_id in tile_ids:
+            x, y = TILE_CENTERS[tile_id]
+            resource_id = tile_resource_ids[tile_id]
+            number = board.tile_numbers[tile_id]
+            
+            # Add resource label
+            abbrev = RESOURCE_ABBREV_BY_ID[resource_id]
+            label_y = y + HEX_RADIUS * 0.4
+            ax.text(x, label_y, abbrev, ha='center', va='center',
+                   fontsize=11, fontweight='bold', 
+                   color='white' if resource_id != DESERT_ID else 'black',
+                   bbox=dict(boxstyle='round,pad=0.3', facecolor='black', alpha=0.3) if resource_id == DESERT_ID else None)
+            
+            # Add number token label
+            if number is not None:
+                ax.text(x, y - HEX_RADIUS * 0.4, str(number), ha='center', va='center',
+                       fontsize=9, fontweight='bold')
+        tile_artists = _artists_since(ax, tile_counts)
+    else:
+        tile_artists = cache['tiles']
+    
+    # Settlement markers (larger circles with player color) are one collection
+    # per axes: created on the first call and updated in place on later ones.
+    # Their positions come from the template, so they do not depend on the board.
+    markers = getattr(ax, '_catan_markers', None)
+    if markers is None:
+        settlement_radius = HEX_RADIUS * 0.15
+        markers = EllipseCollection(2 * settlement_radius, 2 * settlement_radius, 0.0, units='xy',
+                                    offsets=np.empty((0, 2)), offset_transform=ax.transData,
+                                    edgecolors='black', linewidths=2.5, zorder=10)
+        ax.add_collection(markers)
+        ax._catan_markers = markers
+    
+    settlement_counts = _artist_counts(ax)
     
     # Draw vertices and settlements using template positions
+    vertex_owner = {}
     if state:
-        # Use precomputed vertex positions from template
-        for vertex_id, (vx, vy) in VERTEX_POSITIONS.items():
-            # Check if this vertex has a settlement
-            has_settlement = False
-            settlement_player = None
-            
-            for player, vertices in state.houses.items():
-                if vertex_id in vertices:
-                    has_settlement = True
-                    settlement_player = player
-                    break
-            
-            if has_settlement:
-                # Draw settlement (larger circle with player color)
-                color = player_colors.get(settlement_player, '#000000')
-                settlement_radius = HEX_RADIUS * 0.15
-                settlement = Circle((vx, vy), settlement_radius, facecolor=color,
-                                   edgecolor='black', linewidth=2.5, zorder=10)
-                ax.add_patch(settlement)
-                # Add player number
-                ax.text(vx, vy, str(settlement_player), ha='center', va='center',
-                       fontsize=9, fontweight='bold', color='white', zorder=11)
+        # Owner of every settled vertex, built once instead of scanning every
+        # player's settlements for each vertex
+        vertex_owner = {vertex: player for player, vertices in state.houses.items()
+                        for vertex in vertices}
+    
+    # Use precomputed vertex positions from template
+    settled = [vertex_id for vertex_id in VERTEX_POSITIONS if vertex_id in vertex_owner]
+    markers.set_offsets(np.array([VERTEX_POSITIONS[vertex_id] for vertex_id in settled]).reshape(-1, 2))
+    markers.set_facecolors([player_colors.get(vertex_owner[vertex_id], '#000000') for vertex_id in settled])
+    
+    for vertex_id in settled:
+        vx, vy = VERTEX_POSITIONS[vertex_id]
+        # Add player number
+        ax.text(vx, vy, str(vertex_owner[vertex_id]), ha='center', va='center',
+               fontsize=9, fontweight='bold', color='white', zorder=11)
+    
+    ax._catan_cache = {'board': board_key, 'tiles': tile_artists,
+                       'settlements': _artists_since(ax, settlement_counts)}
     
     # Set title
     title = "Catan Board - Optimal Settlement Placement"
@@ -333,18 +426,16 @@ def visualize_board_gui(board: Board, state: Optional[State] = None,
     ax.set_title(title, fontsize=9, pad=15)
     
     # Set reasonable axis limits to show all tiles
-    all_x = [p[0] for p in TILE_CENTERS.values()]
-    all_y = [p[1] for p in TILE_CENTERS.values()]
-    if all_x and all_y:
-        margin = HEX_RADIUS * 1.5
-        ax.set_xlim(min(all_x) - margin, max(all_x) + margin)
-        ax.set_ylim(min(all_y) - margin, max(all_y) + margin)
+    (min_x, min_y), (max_x, max_y) = TILE_CENTERS_BOUNDS
+    margin = HEX_RADIUS * 1.5
+    ax.set_xlim(min_x - margin, max_x + margin)
+    ax.set_ylim(min_y - margin, max_y + margin)
     
     # Add legend
     legend_elements = []
-    for resource, color in resource_colors.items():
+    for resource, color in RESOURCE_COLORS.items():
         legend_elements.append(mpatches.Patch(facecolor=color, edgecolor='black',
-                                            label=f'{resource_abbrev[resource]}: {resource}'))
+                                            label=f'{RESOURCE_ABBREV[resource]}: {resource}'))
     
     if state:
         for player in sorted(state.houses.keys()):
@@ -355,25 +446,85 @@ def visualize_board_gui(board: Board, state: Optional[State] = None,
     
     ax.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(1.02, 1))
     
-    plt.tight_layout()
+    if owns_figure:
+        # Fixed margins instead of tight_layout's text-measuring render pass
+        fig.subplots_adjust(**BOARD_FIGURE_MARGINS)
     
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        save_dpi = 150
+        if owns_figure:
+            bbox_inches = 'tight'
+        else:
+            # 'tight' costs an extra render pass per save. On a reused axes the
+            # tight box only changes with the text around the axes (title and
+            # legend labels) and its fonts, the figure size and DPI, and the
+            # padding, so it is measured once per such layout and reused.
+            rc = plt.rcParams
+            layout_key = (title, tuple(handle.get_label() for handle in legend_elements),
+                          tuple(fig.get_size_inches()), fig.dpi, save_dpi, rc['savefig.pad_inches'],
+                          tuple(rc['font.family']), rc['font.size'], rc['legend.fontsize'])
+            saved_layout = getattr(ax, '_catan_save_bbox', None)
+            if saved_layout is None or saved_layout[0] != layout_key:
+                # Measure at the saving DPI, as savefig does: text extents
+                # depend on it
+                figure_dpi = fig.dpi
+                fig.dpi = save_dpi
+                try:
+                    tight_bbox = fig.get_tightbbox(fig.canvas.get_renderer())
+                finally:
+                    fig.dpi = figure_dpi
+                saved_layout = (layout_key, tight_bbox.padded(rc['savefig.pad_inches']))
+                ax._catan_save_bbox = saved_layout
+            bbox_inches = saved_layout[1]
+        fig.savefig(save_path, dpi=save_dpi, bbox_inches=bbox_inches)
         print(f"Visualization saved to {save_path}")
-    else:
+    elif owns_figure:
         plt.show()
 
 
+def render_board_rgba(board: Board, state: Optional[State] = None, ax=None) -> np.ndarray:
+    """
+    Render the board visualization to an RGBA pixel array.
+    
+    Draws with visualize_board_gui on an Agg canvas, without pyplot, showing
+    or saving, for batch use: the array can be written with any image
+    library (e.g. PIL.Image.fromarray(pixels).save(path)). Passing the ax
+    returned in a previous call's figure reuses it as in visualize_board_gui.
+    
+    Args:
+        board: Board object
+        state: Optional State object to show player settlements
+        ax: Optional axes of a figure with an Agg canvas to draw on
+        
+    Returns:
+        Array of shape (height, width, 4) with dtype uint8
+    """
+    if ax is None:
+        fig = Figure(figsize=(14, 12), dpi=150)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+        fig.subplots_adjust(**BOARD_FIGURE_MARGINS)
+    visualize_board_gui(board, state, ax=ax)
+    canvas = ax.figure.canvas
+    canvas.draw()
+    return np.array(canvas.buffer_rgba())
+
+
 def visualize_settlements_detailed(board: Board, state: State):
     """
     Create a detailed visualization showing which tiles each settlement touches.
     
+    The four player panels (2x2) are drawn on a single axes, each board
+    translated to its panel, so only one axes is created and all hexagons
+    go into one collection.
+    
     Args:
         board: Board object
         state: State object with player settlements
     """
-    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-    axes = axes.flatten()
+    fig, ax = plt.subplots(1, 1, figsize=(16, 12))
+    ax.set_aspect('equal')
+    ax.axis('off')
     
     player_colors = {
         1: '#FF0000',  # Red
@@ -382,82 +533,101 @@ def visualize_settlements_detailed(board: Board, state: State):
         4: '#FFFF00',  # Yellow
     }
     
-    resource_colors = {
-        'wood': '#8B4513',
-        'brick': '#CD5C5C',
-        'wheat': '#FFD700',
-        'ore': '#708090',
-        'sheep': '#90EE90',
-        'desert': '#F5DEB3'
-    }
+    # Tile centers, hexagon corners and colors are the same in every panel;
+    # compute them once
+    tile_centers = {tile_id: hex_to_pixel(row, col, size=1.2)
+                    for tile_id, (row, col) in enumerate(zip(board.tile_rows, board.tile_cols))}
+    hex_tile_ids = list(tile_centers)
+    # Hexagons of radius 1.2 rotated 60 degrees, which gives the same corners
+    # as the pointy-top template hexagon
+    hex_corners = (np.array([tile_centers[tile_id] for tile_id in hex_tile_ids])[:, None, :]
+                   + HEX_CORNER_OFFSETS[None, :, :] * (1.2 / HEX_RADIUS))
+    untouched_facecolors = RESOURCE_RGBA[[board.tile_resource_ids[tile_id] for tile_id in hex_tile_ids]]
+    untouched_facecolors[:, 3] = 0.5
+    touched_facecolor = to_rgba('#FFD700', 0.8)
+    touched_edgecolor = to_rgba('red', 0.8)
+    untouched_edgecolor = to_rgba('black', 0.5)
+    
+    # Panel layout: board extent plus room for the three-line panel titles.
+    # Panel idx sits in column idx % 2 and row idx // 2 (top row first).
+    (min_x, min_y), (max_x, max_y) = hex_corners.reshape(-1, 2).min(axis=0), hex_corners.reshape(-1, 2).max(axis=0)
+    panel_dx = (max_x - min_x) + 1.0
+    panel_dy = (max_y - min_y) + 3.0
+    
+    all_corners = []
+    all_facecolors = []
+    all_edgecolors = []
+    all_linewidths = []
+    settlement_offsets = []
+    settlement_colors = []
     
     for idx, player in enumerate(sorted(state.houses.keys())):
         if idx >= 4:
             break
         
-        ax = axes[idx]
-        ax.set_aspect('equal')
-        ax.axis('off')
-        
         vertices = state.houses[player]
         if len(vertices) != 2:
             continue
         
+        # Translation of this player's panel
+        dx, dy = (idx % 2) * panel_dx, -(idx // 2) * panel_dy
+        
         color = player_colors.get(player, '#000000')
         color_name = ['Red', 'Blue', 'Green', 'Yellow'][player-1]
         
-        # Draw all tiles
-        tile_centers = {}
-        for tile in board.tiles:
-            row, col = tile['row'], tile['col']
-            x, y = hex_to_pixel(row, col, size=1.2)
-            tile_centers[tile['id']] = (x, y)
-            
-            resource = tile['resource']
-            tile_color = resource_colors.get(resource, '#CCCCCC')
-            
-            # Check if this tile is touched by player's settlements
-            is_touched = False
-            for vertex in vertices:
-                if tile['id'] in board.tiles_touching.get(vertex, []):
-                    is_touched = True
-                    break
-            
-            # Draw hexagon (highlighted if touched) - rotated 30 degrees
-            hexagon = RegularPolygon((x, y), numVertices=6, radius=1.2,
-                                    orientation=np.pi/6 + np.pi/6,
-                                    facecolor=tile_color if not is_touched else '#FFD700',
-                                    edgecolor='red' if is_touched else 'black',
-                                    linewidth=3 if is_touched else 1,
-                                    alpha=0.8 if is_touched else 0.5)
-            ax.add_patch(hexagon)
-            
+        # Tiles touched by this player's settlements
+        touched_tiles = set()
+        for vertex in vertices:
+            touched_tiles.update(board.tiles_touching[vertex])
+        
+        # Tiles of this panel, highlighting the touched ones (the patch alpha
+        # is folded into the RGBA colors, per tile)
+        is_touched = np.array([tile_id in touched_tiles for tile_id in hex_tile_ids])[:, None]
+        all_corners.append(hex_corners + (dx, dy))
+        all_facecolors.append(np.where(is_touched, touched_facecolor, untouched_facecolors))
+        all_edgecolors.append(np.where(is_touched, touched_edgecolor, untouched_edgecolor))
+        all_linewidths.extend(np.where(is_touched[:, 0], 3, 1))
+        
+        for tile_id, (x, y) in tile_centers.items():
             # Add number
-            number = tile['number']
+            number = board.tile_numbers[tile_id]
             if number is not None:
-                ax.text(x, y, str(number), ha='center', va='center',
+                ax.text(x + dx, y + dy, str(number), ha='center', va='center',
                        fontsize=9, fontweight='bold')
         
-        # Draw settlements
+        # Settlements
         for vertex in vertices:
-            tile_ids = board.tiles_touching.get(vertex, [])
+            tile_ids = board.tiles_touching[vertex]
             if tile_ids:
                 positions = [tile_centers[tid] for tid in tile_ids if tid in tile_centers]
                 if positions:
-                    vx = sum(p[0] for p in positions) / len(positions)
-                    vy = sum(p[1] for p in positions) / len(positions)
+                    vx = sum(p[0] for p in positions) / len(positions) + dx
+                    vy = sum(p[1] for p in positions) / len(positions) + dy
                     
-                    settlement = Circle((vx, vy), 0.2, facecolor=color,
-                                      edgecolor='black', linewidth=3, zorder=10)
-                    ax.add_patch(settlement)
+                    settlement_offsets.append((vx, vy))
+                    settlement_colors.append(color)
                     ax.text(vx, vy, str(player), ha='center', va='center',
                            fontsize=12, fontweight='bold', color='white', zorder=11)
         
+        # Panel title, centered above the panel's board
         quality = state.quality_of_player(player)
-        ax.set_title(f'Player {player} ({color_name})\n'
-                    f'Settlements at vertices {vertices}\n'
-                    f'Quality: {quality:.4f}', fontsize=11, fontweight='bold')
+        ax.text((min_x + max_x) / 2 + dx, max_y + dy + 0.3,
+                f'Player {player} ({color_name})\n'
+                f'Settlements at vertices {vertices}\n'
+                f'Quality: {quality:.4f}', ha='center', va='bottom', fontsize=11, fontweight='bold')
+    
+    # All panels' hexagons and settlements, one collection each
+    if all_corners:
+        ax.add_collection(PolyCollection(np.concatenate(all_corners), facecolors=np.concatenate(all_facecolors),
+                                         edgecolors=np.concatenate(all_edgecolors), linewidths=all_linewidths))
+    if settlement_offsets:
+        ax.add_collection(EllipseCollection(0.4, 0.4, 0.0, units='xy', offsets=settlement_offsets,
+                                            offset_transform=ax.transData, facecolors=settlement_colors,
+                                            edgecolors='black', linewidths=3, zorder=10))
     
-    plt.tight_layout()
+    # Limits covering the 2x2 panel grid, titles included
+    ax.set_xlim(min_x - 0.5, max_x + panel_dx + 0.5)
+    ax.set_ylim(min_y - panel_dy - 0.5, max_y + 3.0)
+    
+    fig.subplots_adjust(left=0.01, right=0.99, top=0.99, bottom=0.01)
     plt.show()
-